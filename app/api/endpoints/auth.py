@@ -4,6 +4,9 @@ from fastapi.responses import RedirectResponse
 from starlette.requests import Request
 
 from pydantic import BaseModel
+from sqlalchemy.orm import Session
+from app.db.database import get_db
+from app.api.deps import resolve_user_id
 from app.services.email_service import email_service
 
 # Mock DB for OTPs (In-memory for simplicity)
@@ -30,7 +33,7 @@ async def send_otp(request: EmailRequest):
     return {"message": "OTP sent successfully"}
 
 @router.post("/email/verify-otp")
-async def verify_otp(request: Request, data: VerifyRequest):
+async def verify_otp(request: Request, data: VerifyRequest, db: Session = Depends(get_db)):
     stored_otp = otp_store.get(data.email)
     
     if not stored_otp or stored_otp != data.otp:
@@ -38,12 +41,15 @@ async def verify_otp(request: Request, data: VerifyRequest):
     
     # Login Success - Create Session
     # Using UI Avatars for consistent profile images
-    request.session["user"] = {
+    user_data = {
         "id": data.email,
         "name": data.email.split('@')[0].title(),
         "email": data.email,
         "picture": f"https://ui-avatars.com/api/?name={data.email}&background=2563eb&color=fff"
     }
+    # Store the DB user id in the signed session so requests skip the lookup
+    user_data["user_id"] = resolve_user_id(db, user_data)
+    request.session["user"] = user_data
     
     # Clear OTP
     del otp_store[data.email]
@@ -51,16 +57,18 @@ async def verify_otp(request: Request, data: VerifyRequest):
     return {"message": "Login successful"}
 
 @router.get("/mock")
-async def mock_login(request: Request):
+async def mock_login(request: Request, db: Session = Depends(get_db)):
     """
     Simulated Google Login.
     """
-    request.session["user"] = {
+    user_data = {
         "id": "1",
         "name": "Parth (Demo)",
         "email": "parth@example.com",
         "picture": "https://ui-avatars.com/api/?name=Parth+Demo&background=2563eb&color=fff"
     }
+    user_data["user_id"] = resolve_user_id(db, user_data)
+    request.session["user"] = user_data
     return RedirectResponse(url="/")
 
 @router.get("/logout")
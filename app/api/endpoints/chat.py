@@ -2,36 +2,20 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from app.db.database import get_db
+from app.api.deps import get_current_user_id
 from app.services.ai_service import ai_service
 from app.services.profile_extractor import ProfileExtractor
+from app.services.profile_cache import get_cached_profile_document
 from app.schemas.schemas import ChatRequest, Message
-from app.models.models import ChatSession, ChatMessage, User, UserProfile, Experience, Education, Skill, Project
+from app.models.models import ChatSession, ChatMessage, UserProfile, Experience, Education, Skill, Project
 
 router = APIRouter()
 profile_extractor = ProfileExtractor()
 
 @router.post("/message")
 async def chat_message(request_obj: Request, chat_req: ChatRequest, db: Session = Depends(get_db)):
-    # Get user from session
-    user_data = request_obj.session.get("user")
-    if not user_data:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    
-    user_email = user_data.get("email")
-    
-    # 1. Get or Create User (by email, not ID)
-    user = db.query(User).filter(User.email == user_email).first()
-    if not user:
-        # Create new user with auto-incrementing ID
-        user = User(
-            username=user_data.get("name", user_email.split('@')[0]),
-            email=user_email
-        )
-        db.add(user)
-        db.commit()
-        db.refresh(user)
-    
-    user_id = user.id
+    # 1. Resolve the logged-in user
+    user_id = get_current_user_id(request_obj, db)
 
     # 2. Get or Create Session
     if chat_req.session_id:
@@ -39,7 +23,7 @@ async def chat_message(request_obj: Request, chat_req: ChatRequest, db: Session
         if not session:
              raise HTTPException(status_code=404, detail="Session not found")
     else:
-        session = ChatSession(user_id=user.id)
+        session = ChatSession(user_id=user_id)
         db.add(session)
         db.commit()
         db.refresh(session)
@@ -65,37 +49,33 @@ async def chat_message(request_obj: Request, chat_req: ChatRequest, db: Session
     
     
     # NEW: Fetch Current Profile for Context
-    profile_context = {}
-    curr_profile = db.query(UserProfile).filter(UserProfile.user_id == user_id).first()
-    if curr_profile:
-        profile_context = {
-            "personal_info": {
-                "name": curr_profile.full_name,
-                "email": curr_profile.email,
-                "phone": curr_profile.phone,
-                "location": curr_profile.location,
-                "linkedin": curr_profile.linkedin,
-                "github": curr_profile.github,
-            },
-            "summary": curr_profile.summary
-        }
-        # Add quick summary of lists
-        exps = db.query(Experience).filter(Experience.user_id == user_id).all()
-        if exps:
-            profile_context["experience"] = [{"title": e.title, "company": e.company, "years": f"{e.start_date}-{e.end_date}"} for e in exps]
+    document = get_cached_profile_document(db, user_id)
+    personal = document["profile"]
+    profile_context = {
+        "personal_info": {
+            "name": personal["full_name"],
+            "email": personal["email"],
+            "phone": personal["phone"],
+            "location": personal["location"],
+            "linkedin": personal["linkedin"],
+            "github": personal["github"],
+        },
+        "summary": personal["summary"]
+    }
+    # Add quick summary of lists
+    if document["experiences"]:
+        profile_context["experience"] = [{"title": e["title"], "company": e["company"], "years": f"{e['start_date']}-{e['end_date']}"} for e in document["experiences"]]
+    
+    if document["education"]:
+        profile_context["education"] = [{"degree": e["degree"], "school": e["institution"]} for e in document["education"]]
         
-        edus = db.query(Education).filter(Education.user_id == user_id).all()
-        if edus:
-            profile_context["education"] = [{"degree": e.degree, "school": e.institution} for e in edus]
-            
-        skills = db.query(Skill).filter(Skill.user_id == user_id).all()
-        if skills:
-            # Flatten skills for context
-            all_skills = []
-            for s in skills:
-                if s.skills:
-                    all_skills.extend(s.skills)
-            profile_context["skills"] = all_skills
+    if document["skills"]:
+        # Flatten skills for context
+        all_skills = []
+        for s in document["skills"]:
+            if s["skills"]:
+                all_skills.extend(s["skills"])
+        profile_context["skills"] = all_skills
 
     ai_response_data = await ai_service.generate_chat_response(history, chat_req.message, profile_context=profile_context)
     print(f"DEBUG: ai_response_data keys: {ai_response_data.keys()}")
@@ -212,30 +192,23 @@ async def chat_message(request_obj: Request, chat_req: ChatRequest, db: Session
         # Don't fail the chat if extraction fails
     
     # 7. Fetch latest profile data for UI update
-    current_profile = db.query(UserProfile).filter(UserProfile.user_id == user_id).first()
-    
-    # Get related data
-    experiences = db.query(Experience).filter(Experience.user_id == user_id).all()
-    education = db.query(Education).filter(Education.user_id == user_id).all()
-    skills = db.query(Skill).filter(Skill.user_id == user_id).all()
-    projects = db.query(Project).filter(Project.user_id == user_id).all()
-    
-    import json
+    document = get_cached_profile_document(db, user_id)
+    personal = document["profile"]
     profile_data = {
-        "full_name": current_profile.full_name if current_profile else "",
-        "email": current_profile.email if current_profile else "",
-        "phone": current_profile.phone if current_profile else "",
-        "location": current_profile.location if current_profile else "",
-        "linkedin": current_profile.linkedin if current_profile else "",
-        "github": current_profile.github if current_profile else "",
-        "portfolio": current_profile.portfolio if current_profile else "",
-        "summary": current_profile.summary if current_profile else "",
-        "languages": json.loads(current_profile.languages) if current_profile and current_profile.languages else [],
-        "hobbies": json.loads(current_profile.hobbies) if current_profile and current_profile.hobbies else [],
-        "experience": [{"id": e.id, "title": e.title, "company": e.company, "start_date": e.start_date, "end_date": e.end_date} for e in experiences],
-        "education": [{"id": e.id, "degree": e.degree, "institution": e.institution} for e in education],
-        "skills": [{"id": s.id, "category": s.category, "skills": s.skills} for s in skills],
-        "projects": [{"id": p.id, "name": p.name, "description": p.description} for p in projects]
+        "full_name": personal["full_name"] or "",
+        "email": personal["email"] or "",
+        "phone": personal["phone"] or "",
+        "location": personal["location"] or "",
+        "linkedin": personal["linkedin"] or "",
+        "github": personal["github"] or "",
+        "portfolio": personal["portfolio"] or "",
+        "summary": personal["summary"] or "",
+        "languages": personal["languages"],
+        "hobbies": personal["hobbies"],
+        "experience": [{"id": e["id"], "title": e["title"], "company": e["company"], "start_date": e["start_date"], "end_date": e["end_date"]} for e in document["experiences"]],
+        "education": [{"id": e["id"], "degree": e["degree"], "institution": e["institution"]} for e in document["education"]],
+        "skills": [{"id": s["id"], "category": s["category"], "skills": s["skills"]} for s in document["skills"]],
+        "projects": [{"id": p["id"], "name": p["name"], "description": p["description"]} for p in document["projects"]]
     }
     
     return {
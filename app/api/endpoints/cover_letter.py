@@ -1,96 +1,79 @@
 from fastapi import APIRouter, HTTPException, Depends
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
-from app.services.ai_service import AIService
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.enums import TA_LEFT
-import io
+from typing import List
+from app.services.ai_service import ai_service
+from app.services.cover_letter_renderer import cover_letter_pdfs
+from app.services.cover_letter_cache import cover_letter_key, get_cached_cover_letter
 from datetime import datetime
 from sqlalchemy.orm import Session
-from app.db.database import get_db
-from app.models.models import User, UserProfile, Experience, Skill, Project, Education
+from app.db.database import SessionLocal, get_db
+from app.models.models import CoverLetter
+from app.api.deps import get_current_user_id
+from app.services.profile_document import get_profile_document
 from fastapi import Request
+import asyncio
 import json
 
 router = APIRouter()
 
-# Dependency (Copied for stability, should be shared)
-def get_current_user(request: Request, db: Session = Depends(get_db)) -> User:
-    user_data = request.session.get("user")
-    if not user_data:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    user = db.query(User).filter(User.email == user_data["email"]).first()
-    if not user:
-        raise HTTPException(status_code=401, detail="User not found")
-    return user
-
 class CoverLetterRequest(BaseModel):
     job_title: str
     company_name: str
     job_description: str
     tone: str = "professional"
     resume_context: str | None = None
+    regenerate: bool = False  # Skip the result cache and always call Gemini
+
+class CoverLetterVariantsRequest(CoverLetterRequest):
+    tones: List[str] = ["professional", "enthusiastic", "creative"]
 
 class CoverLetterDownloadRequest(BaseModel):
     cover_letter: str
     job_title: str
     company_name: str
 
-@router.post("/generate")
-async def generate_cover_letter(
-    request: CoverLetterRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """Generate a personalized cover letter using AI and User Profile"""
-    try:
-        candidate_info = ""
+# Tone-specific instructions
+TONE_INSTRUCTIONS = {
+    "professional": "Use formal, corporate language. Be respectful and professional throughout.",
+    "enthusiastic": "Use energetic, passionate language. Show genuine excitement about the opportunity.",
+    "creative": "Use unique, personality-driven language. Be memorable and showcase creativity."
+}
 
-        if request.resume_context and request.resume_context.strip():
-             # User provided/edited context
-             candidate_info = request.resume_context
-        else:
-            # Fallback to fetching User Profile Data from DB
-            profile = db.query(UserProfile).filter(UserProfile.user_id == current_user.id).first()
-            experiences = db.query(Experience).filter(Experience.user_id == current_user.id).all()
-            skills = db.query(Skill).filter(Skill.user_id == current_user.id).all()
-            projects = db.query(Project).filter(Project.user_id == current_user.id).all()
-            education = db.query(Education).filter(Education.user_id == current_user.id).all()
-
-            # format data for prompt
-            candidate_data = {
-                "name": profile.full_name if profile else "Candidate",
-                "summary": profile.summary if profile else "",
-                "experience": [{
-                    "title": e.title, "company": e.company, 
-                    "description": e.description, "achievements": e.achievements
-                } for e in experiences],
-                "skills": [{
-                    "category": s.category, "skills": s.skills
-                } for s in skills],
-                "projects": [{
-                    "name": p.name, "description": p.description, "technologies": p.technologies
-                } for p in projects],
-                 "education": [{
-                    "degree": edu.degree, "institution": edu.institution
-                } for edu in education]
-            }
-            candidate_info = json.dumps(candidate_data, indent=2)
+def _candidate_info(request: CoverLetterRequest, db: Session, user_id: int) -> str:
+    """Candidate context for the prompt: the user's edited text, or their profile document"""
+    if request.resume_context and request.resume_context.strip():
+        # User provided/edited context
+        return request.resume_context
 
-        # Define tone-specific instructions
-        tone_instructions = {
-            "professional": "Use formal, corporate language. Be respectful and professional throughout.",
-            "enthusiastic": "Use energetic, passionate language. Show genuine excitement about the opportunity.",
-            "creative": "Use unique, personality-driven language. Be memorable and showcase creativity."
-        }
-        
-        tone_instruction = tone_instructions.get(request.tone, tone_instructions["professional"])
-        
-        # Create AI prompt
-        prompt = f"""Generate a highly personalized professional cover letter.
+    # Fallback to the User Profile document
+    document = get_profile_document(db, user_id)
+    personal = document["profile"]
+
+    # format data for prompt
+    candidate_data = {
+        "name": personal["full_name"] or "Candidate",
+        "summary": personal["summary"] or "",
+        "experience": [{
+            "title": e["title"], "company": e["company"], 
+            "description": e["description"], "achievements": e["achievements"]
+        } for e in document["experiences"]],
+        "skills": [{
+            "category": s["category"], "skills": s["skills"]
+        } for s in document["skills"]],
+        "projects": [{
+            "name": p["name"], "description": p["description"], "technologies": p["technologies"]
+        } for p in document["projects"]],
+         "education": [{
+            "degree": edu["degree"], "institution": edu["institution"]
+        } for edu in document["education"]]
+    }
+    return json.dumps(candidate_data, indent=2)
+
+def _cover_letter_prompt(request: CoverLetterRequest, candidate_info: str) -> str:
+    tone_instruction = TONE_INSTRUCTIONS.get(request.tone, TONE_INSTRUCTIONS["professional"])
+    
+    return f"""Generate a highly personalized professional cover letter.
 
         CANDIDATE PROFILE CONTEXT:
         {candidate_info}
@@ -114,62 +97,200 @@ async def generate_cover_letter(
 
         Generate ONLY the cover letter text, no additional commentary."""
 
-        # Call Gemini API
-        ai_service = AIService()
-        cover_letter = await ai_service.generate_content(prompt)
+def _cache_key(db: Session, user_id: int, request: CoverLetterRequest) -> str:
+    return cover_letter_key(
+        db, user_id, request.job_title, request.company_name,
+        request.job_description, request.tone, request.resume_context
+    )
+
+def _save_cover_letter(db: Session, user_id: int, request: CoverLetterRequest, content: str, cache_key: str) -> CoverLetter:
+    cover_letter = CoverLetter(
+        user_id=user_id,
+        job_title=request.job_title,
+        company_name=request.company_name,
+        tone=request.tone,
+        content=content,
+        cache_key=cache_key
+    )
+    db.add(cover_letter)
+    db.commit()
+    return cover_letter
+
+@router.post("/generate")
+async def generate_cover_letter(
+    request: CoverLetterRequest,
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+):
+    """Generate a personalized cover letter using AI and User Profile"""
+    try:
+        # Same profile version, job and tone as an earlier request: reuse that letter
+        cache_key = _cache_key(db, user_id, request)
+        cached = get_cached_cover_letter(db, user_id, cache_key, regenerate=request.regenerate)
+        if cached:
+            return {"cover_letter": cached.content, "id": cached.id, "cached": True}
+
+        prompt = _cover_letter_prompt(request, _candidate_info(request, db, user_id))
+
+        # Call Gemini API (shared service: one admission limit for all requests)
+        cover_letter = (await ai_service.generate_text(prompt)).strip()
+        saved = _save_cover_letter(db, user_id, request, cover_letter, cache_key)
         
-        return {"cover_letter": cover_letter}
+        return {"cover_letter": cover_letter, "id": saved.id, "cached": False}
         
     except Exception as e:
         print(f"Cover letter error: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to generate cover letter: {str(e)}")
 
+def _event(event_type: str, **data) -> bytes:
+    return (json.dumps({"type": event_type, **data}) + "\n").encode("utf-8")
+
+def _paragraphs(text: str) -> list:
+    return [paragraph.strip() for paragraph in text.split("\n\n") if paragraph.strip()]
+
+async def _replay_cover_letter(cover_letter: CoverLetter):
+    """The stream format for a cached letter: all paragraphs at once, then "done" """
+    for paragraph in _paragraphs(cover_letter.content):
+        yield _event("paragraph", text=paragraph)
+    yield _event("done", id=cover_letter.id, cover_letter=cover_letter.content, cached=True)
+
+async def _stream_cover_letter(prompt: str, request: CoverLetterRequest, user_id: int, cache_key: str):
+    """
+    NDJSON events: one "paragraph" per completed paragraph, then "done" with
+    the full text (saved to cover_letters) or "error". If the client goes
+    away mid-stream the generation is cancelled and nothing is saved.
+    """
+    stream = ai_service.generate_content_stream(prompt)
+    text = ""
+    sent = 0  # Offset in `text` up to which paragraphs have been sent
+    try:
+        async for chunk in stream:
+            text += chunk
+            # A paragraph is complete once the blank line after it arrives
+            while (end := text.find("\n\n", sent)) != -1:
+                paragraph = text[sent:end].strip()
+                sent = end + 2
+                if paragraph:
+                    yield _event("paragraph", text=paragraph)
+
+        if text[sent:].strip():
+            yield _event("paragraph", text=text[sent:].strip())
+
+        db = SessionLocal()
+        try:
+            cover_letter = _save_cover_letter(db, user_id, request, text.strip(), cache_key)
+            cover_letter_id = cover_letter.id
+        finally:
+            db.close()
+        yield _event("done", id=cover_letter_id, cover_letter=text.strip(), cached=False)
+    except Exception as e:
+        print(f"Cover letter stream error: {e}")
+        yield _event("error", detail=f"Failed to generate cover letter: {str(e)}")
+    finally:
+        await stream.aclose()
+
+@router.post("/generate/stream")
+async def stream_cover_letter(
+    request: CoverLetterRequest,
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+):
+    """Generate the cover letter as a stream of paragraphs (application/x-ndjson)"""
+    cache_key = _cache_key(db, user_id, request)
+    cached = get_cached_cover_letter(db, user_id, cache_key, regenerate=request.regenerate)
+    if cached:
+        events = _replay_cover_letter(cached)
+    else:
+        prompt = _cover_letter_prompt(request, _candidate_info(request, db, user_id))
+        events = _stream_cover_letter(prompt, request, user_id, cache_key)
+    return StreamingResponse(
+        events,
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def _generate_variant(prompt: str, request: CoverLetterRequest, user_id: int, cache_key: str) -> bytes:
+    try:
+        text = (await ai_service.generate_text(prompt)).strip()
+    except Exception as e:
+        print(f"Cover letter variant error ({request.tone}): {e}")
+        return _event("error", tone=request.tone, detail=f"Failed to generate cover letter: {str(e)}")
+
+    db = SessionLocal()
+    try:
+        cover_letter = _save_cover_letter(db, user_id, request, text, cache_key)
+        return _event("variant", tone=request.tone, id=cover_letter.id, cover_letter=text, cached=False)
+    finally:
+        db.close()
+
+async def _stream_variants(cached: dict, prompts: dict, keys: dict, request: CoverLetterVariantsRequest, user_id: int):
+    """
+    NDJSON: one "variant" (or "error") event per tone, cached tones first and
+    the rest in completion order, then "done"
+    """
+    for tone, cover_letter in cached.items():
+        yield _event("variant", tone=tone, id=cover_letter.id, cover_letter=cover_letter.content, cached=True)
+
+    tasks = [
+        asyncio.ensure_future(
+            _generate_variant(prompt, request.model_copy(update={"tone": tone}), user_id, keys[tone])
+        )
+        for tone, prompt in prompts.items()
+    ]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            yield await finished
+        yield _event("done")
+    finally:
+        # Client disconnected: stop the generations still running
+        for task in tasks:
+            task.cancel()
+
+@router.post("/generate/variants")
+async def generate_cover_letter_variants(
+    request: CoverLetterVariantsRequest,
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+):
+    """
+    Generate the cover letter in several tones at once (application/x-ndjson).
+    The tones run concurrently, within AIService's admission limit, and each
+    variant is sent as soon as it is ready.
+    """
+    tones = [tone for tone in dict.fromkeys(request.tones) if tone in TONE_INSTRUCTIONS]
+    if not tones:
+        raise HTTPException(status_code=400, detail=f"tones must be among: {', '.join(TONE_INSTRUCTIONS)}")
+
+    keys = {tone: _cache_key(db, user_id, request.model_copy(update={"tone": tone})) for tone in tones}
+    cached = {}
+    for tone in tones:
+        cover_letter = get_cached_cover_letter(db, user_id, keys[tone], regenerate=request.regenerate)
+        if cover_letter:
+            cached[tone] = cover_letter
+
+    # The candidate context is built once and shared by every uncached tone's prompt
+    missing = [tone for tone in tones if tone not in cached]
+    candidate_info = _candidate_info(request, db, user_id) if missing else ""
+    prompts = {
+        tone: _cover_letter_prompt(request.model_copy(update={"tone": tone}), candidate_info)
+        for tone in missing
+    }
+    return StreamingResponse(
+        _stream_variants(cached, prompts, keys, request, user_id),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.post("/download")
 async def download_cover_letter(request: CoverLetterDownloadRequest):
     """Generate PDF of cover letter"""
     try:
-        # Create PDF in memory
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter,
-                              rightMargin=72, leftMargin=72,
-                              topMargin=72, bottomMargin=18)
-        
-        # Container for the 'Flowable' objects
-        elements = []
-        
-        # Define styles
-        styles = getSampleStyleSheet()
-        
-        # Custom style for cover letter
-        cover_letter_style = ParagraphStyle(
-            'CoverLetter',
-            parent=styles['Normal'],
-            fontSize=11,
-            leading=16,
-            alignment=TA_LEFT,
-            spaceAfter=12,
-        )
-        
-        # Add date
+        # Rendered in the process pool (ReportLab layout would block the event
+        # loop), or served from the cache if this exact letter was rendered today
         date_text = datetime.now().strftime("%B %d, %Y")
-        elements.append(Paragraph(date_text, cover_letter_style))
-        elements.append(Spacer(1, 0.2*inch))
-        
-        # Split cover letter into paragraphs
-        paragraphs = request.cover_letter.split('\n\n')
-        
-        for para in paragraphs:
-            if para.strip():
-                # Clean up the text
-                para = para.strip()
-                elements.append(Paragraph(para, cover_letter_style))
-                elements.append(Spacer(1, 0.15*inch))
-        
-        # Build PDF
-        doc.build(elements)
-        
-        # Get PDF data
-        buffer.seek(0)
+        pdf_bytes = await cover_letter_pdfs.render(
+            request.cover_letter, request.job_title, request.company_name, date_text
+        )
         
         # Sanitize filename
         import re
@@ -177,10 +298,11 @@ async def download_cover_letter(request: CoverLetterDownloadRequest):
         if not safe_name:
             safe_name = "Cover_Letter"
             
-        print(f"PDF Generated. Size: {len(buffer.getvalue())} bytes. Filename: {safe_name}.pdf")
+        print(f"PDF Generated. Size: {len(pdf_bytes)} bytes. Filename: {safe_name}.pdf")
 
-        return StreamingResponse(
-            buffer,
+        # Plain Response: sends the bytes as-is (no BytesIO copy) with a Content-Length
+        return Response(
+            content=pdf_bytes,
             media_type="application/pdf",
             headers={
                 "Content-Disposition": f"attachment; filename=Cover_Letter_{safe_name}.pdf"
@@ -193,7 +315,7 @@ async def download_cover_letter(request: CoverLetterDownloadRequest):
 @router.post("/suggestions")
 async def suggest_roles_and_companies(
     request: Request,
-    current_user: User = Depends(get_current_user),
+    user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db)
 ):
     """Suggest job roles and companies based on profile"""
@@ -206,20 +328,18 @@ async def suggest_roles_and_companies(
         if resume_context and resume_context.strip():
              candidate_info = resume_context
         else:
-            # Fallback to DB
-            profile = db.query(UserProfile).filter(UserProfile.user_id == current_user.id).first()
-            experiences = db.query(Experience).filter(Experience.user_id == current_user.id).all()
-            skills = db.query(Skill).filter(Skill.user_id == current_user.id).all()
+            # Fallback to the User Profile document
+            document = get_profile_document(db, user_id)
+            personal = document["profile"]
             
             candidate_data = {
-                "name": profile.full_name if profile else "Candidate",
-                "summary": profile.summary if profile else "",
-                "experience": [e.title for e in experiences],
-                "skills": [s.category + ": " + ", ".join(s.skills) for s in skills]
+                "name": personal["full_name"] or "Candidate",
+                "summary": personal["summary"] or "",
+                "experience": [e["title"] for e in document["experiences"]],
+                "skills": [s["category"] + ": " + ", ".join(s["skills"]) for s in document["skills"]]
             }
             candidate_info = json.dumps(candidate_data, indent=2)
 
-        ai_service = AIService()
         suggestions = await ai_service.suggest_jobs(candidate_info)
         return suggestions
 
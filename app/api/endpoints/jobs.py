@@ -1,10 +1,14 @@
 
 
 from fastapi import APIRouter, Depends, Request
+from fastapi.responses import Response
 from app.services.job_service import job_service
 from app.services.ai_service import ai_service
 from app.schemas.schemas import JobSearchRequest
 from app.db.database import get_db
+from app.api.deps import get_current_user_id
+from app.services.data_version import get_data_version
+from app.core.http_cache import make_etag, etag_matches, not_modified, cache_headers
 from sqlalchemy.orm import Session
 from typing import List, Dict
 
@@ -15,14 +19,13 @@ async def search_jobs(request: JobSearchRequest):
     """
     Searches for jobs using the configured Job Service (Arbeitnow + Remotive + Fallback).
     """
-    return job_service.search_jobs(request.query, request.location)
+    return await job_service.search_jobs(request.query, request.location)
 
 @router.get("/ai-recommendations")
 async def get_ai_recommendations(request: Request, db: Session = Depends(get_db)):
     """
     Get AI-powered job recommendations based on user profile.
     """
-    from app.api.endpoints.profile import get_current_user_id
     from app.models.models import UserProfile, Experience, Skill
     
     try:
@@ -42,7 +45,7 @@ async def get_ai_recommendations(request: Request, db: Session = Depends(get_db)
                 if skill_list and len(skill_list) > 0:
                     # Search for real jobs using the first skill
                     search_query = skill_list[0]
-                    jobs = job_service.search_jobs(search_query, "Remote")
+                    jobs = await job_service.search_jobs(search_query, "Remote")
                     
                     # Add only unique jobs (check title similarity)
                     added_from_category = 0
@@ -76,7 +79,7 @@ async def get_ai_recommendations(request: Request, db: Session = Depends(get_db)
         # If we still need more recommendations, add from experience
         if experiences and len(recommendations) < 5:
             latest_exp = experiences[0]
-            jobs = job_service.search_jobs(latest_exp.title, "Remote")
+            jobs = await job_service.search_jobs(latest_exp.title, "Remote")
             
             for job in jobs:
                 if len(recommendations) >= 5:
@@ -109,16 +112,13 @@ async def get_ai_recommendations(request: Request, db: Session = Depends(get_db)
         return {"recommendations": []}
 
 @router.post("/save")
-async def save_job(job_data: Dict, db: Session = Depends(get_db)):
+async def save_job(job_data: Dict, user_id: int = Depends(get_current_user_id), db: Session = Depends(get_db)):
     """
     Save a job for later viewing/application.
     """
     from app.models.models import SavedJob
     
     try:
-        # For now, using hardcoded user_id (in production, get from session)
-        user_id = 1
-        
         # Check if job already saved
         existing = db.query(SavedJob).filter(
             SavedJob.user_id == user_id,
@@ -151,15 +151,13 @@ async def save_job(job_data: Dict, db: Session = Depends(get_db)):
         return {"error": str(e)}
 
 @router.delete("/unsave/{job_id}")
-async def unsave_job(job_id: int, db: Session = Depends(get_db)):
+async def unsave_job(job_id: int, user_id: int = Depends(get_current_user_id), db: Session = Depends(get_db)):
     """
     Remove a saved job.
     """
     from app.models.models import SavedJob
     
     try:
-        user_id = 1  # Hardcoded for now
-        
         saved_job = db.query(SavedJob).filter(
             SavedJob.id == job_id,
             SavedJob.user_id == user_id
@@ -178,18 +176,26 @@ async def unsave_job(job_id: int, db: Session = Depends(get_db)):
         return {"error": str(e)}
 
 @router.get("/saved")
-async def get_saved_jobs(db: Session = Depends(get_db)):
+async def get_saved_jobs(
+    request: Request,
+    response: Response,
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+):
     """
-    Get all saved jobs for the user.
+    Get all saved jobs for the user (supports If-None-Match).
     """
     from app.models.models import SavedJob
     
     try:
-        user_id = 1  # Hardcoded for now
+        etag = make_etag("saved-jobs", user_id, get_data_version(db, user_id))
+        if etag_matches(request, etag):
+            return not_modified(etag)
         
         saved_jobs = db.query(SavedJob).filter(
             SavedJob.user_id == user_id
         ).order_by(SavedJob.created_at.desc()).all()
+        response.headers.update(cache_headers(etag))
         
         return [{
             "id": job.id,
@@ -210,7 +216,7 @@ async def get_saved_jobs(db: Session = Depends(get_db)):
         return []
 
 @router.patch("/update-status/{job_id}")
-async def update_job_status(job_id: int, status_data: Dict, db: Session = Depends(get_db)):
+async def update_job_status(job_id: int, status_data: Dict, user_id: int = Depends(get_current_user_id), db: Session = Depends(get_db)):
     """
     Update the application status of a saved job.
     """
@@ -218,8 +224,6 @@ async def update_job_status(job_id: int, status_data: Dict, db: Session = Depend
     from datetime import datetime
     
     try:
-        user_id = 1  # Hardcoded for now
-        
         saved_job = db.query(SavedJob).filter(
             SavedJob.id == job_id,
             SavedJob.user_id == user_id
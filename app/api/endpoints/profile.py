@@ -1,11 +1,21 @@
 from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import Response, FileResponse
 from sqlalchemy.orm import Session
-from pydantic import BaseModel
-from typing import List, Optional
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy import update, delete, func
+from pydantic import BaseModel, ValidationError
+from typing import List, Optional, Literal, Union
+from itertools import groupby
 from app.db.database import get_db
+from app.api.deps import get_current_user_id
 from app.models.models import UserProfile, Experience, Education, Skill, Project, ResumeHistory
+from app.services.profile_cache import get_versioned_profile_payload, get_cached_profile_document
+from app.services.profile_document import mark_profile_dirty, get_document_version
+from app.services.data_version import get_data_version
+from app.services.resume_generator import resume_generator
+from app.core.http_cache import make_etag, etag_matches, not_modified, cache_headers
 from datetime import datetime
-import json
+import os
 
 router = APIRouter()
 
@@ -51,111 +61,37 @@ class ProjectCreate(BaseModel):
     url: Optional[str] = None
     technologies: List[str] = []
 
-# Helper function to get user ID from session
-# Helper function to get user ID from session/DB
-def get_current_user_id(request: Request, db: Session) -> int:
-    user_data = request.session.get("user")
-    if not user_data:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    
-    # Robust lookup by email
-    email = user_data.get("email")
-    from app.models.models import User
-    user = db.query(User).filter(User.email == email).first()
-    
-    if not user:
-        # Create user if missing
-        user = User(
-            username=user_data.get("name", email.split('@')[0]),
-            email=email
-        )
-        db.add(user)
-        db.commit()
-        db.refresh(user)
-        
-    return user.id
+class ProfileOperation(BaseModel):
+    op: Literal["create", "update", "delete", "reorder"]
+    section: Literal["profile", "experience", "education", "skills", "projects"]
+    id: Optional[Union[int, str]] = None   # Row id, or the ref of a row created earlier in the batch
+    ref: Optional[str] = None              # Client handle for a created row, echoed back with its new id
+    data: Optional[dict] = None
+    ids: Optional[List[Union[int, str]]] = None  # reorder: rows in their new order (unlisted rows follow in their current order)
+
+class ProfileBatchRequest(BaseModel):
+    operations: List[ProfileOperation]
 
 # Profile Endpoints
 
 @router.get("/")
 async def get_profile(request: Request, db: Session = Depends(get_db)):
-    """Get user's complete profile"""
+    """Get user's complete profile (supports If-None-Match)"""
     user_id = get_current_user_id(request, db)
     
-    # Get or create profile
-    profile = db.query(UserProfile).filter(UserProfile.user_id == user_id).first()
-    if not profile:
-        # Create empty profile
-        profile = UserProfile(user_id=user_id)
-        db.add(profile)
-        db.commit()
-        db.refresh(profile)
-    
-    # Get all related data
-    experiences = db.query(Experience).filter(Experience.user_id == user_id).order_by(Experience.order).all()
-    education = db.query(Education).filter(Education.user_id == user_id).order_by(Education.order).all()
-    skills = db.query(Skill).filter(Skill.user_id == user_id).order_by(Skill.order).all()
-    projects = db.query(Project).filter(Project.user_id == user_id).order_by(Project.order).all()
-    
-    return {
-        "profile": {
-            "full_name": profile.full_name,
-            "email": profile.email,
-            "phone": profile.phone,
-            "location": profile.location,
-            "linkedin": profile.linkedin,
-            "github": profile.github,
-            "portfolio": profile.portfolio,
-            "summary": profile.summary,
-            "languages": json.loads(profile.languages) if profile.languages else [],
-            "hobbies": json.loads(profile.hobbies) if profile.hobbies else [],
-            "selected_template": profile.selected_template,
-        },
-        "experiences": [
-            {
-                "id": exp.id,
-                "title": exp.title,
-                "company": exp.company,
-                "location": exp.location,
-                "start_date": exp.start_date,
-                "end_date": exp.end_date,
-                "is_current": exp.is_current,
-                "description": exp.description,
-                "achievements": exp.achievements or []
-            }
-            for exp in experiences
-        ],
-        "education": [
-            {
-                "id": edu.id,
-                "degree": edu.degree,
-                "institution": edu.institution,
-                "location": edu.location,
-                "graduation_date": edu.graduation_date,
-                "gpa": edu.gpa
-            }
-            for edu in education
-        ],
-        "skills": [
-            {
-                "id": skill.id,
-                "category": skill.category,
-                "skills": skill.skills or []
-            }
-            for skill in skills
-        ],
-        "projects": [
-            {
-                "id": proj.id,
-                "name": proj.name,
-                "description": proj.description,
-                "date": proj.date,
-                "url": proj.url,
-                "technologies": proj.technologies or []
-            }
-            for proj in projects
-        ]
-    }
+    # Conditional GET: answer from the document version alone
+    version = get_document_version(db, user_id)
+    if version is not None:
+        etag = make_etag("profile", user_id, version)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+    
+    version, payload = get_versioned_profile_payload(db, user_id, version)
+    return Response(
+        content=payload,
+        media_type="application/json",
+        headers=cache_headers(make_etag("profile", user_id, version))
+    )
 
 @router.put("/")
 async def update_profile(
@@ -467,13 +403,168 @@ async def delete_project(
     db.commit()
     return {"success": True, "message": "Project deleted"}
 
+# Batch Endpoint
+
+BATCH_SECTIONS = {
+    "experience": (Experience, ExperienceCreate),
+    "education": (Education, EducationCreate),
+    "skills": (Skill, SkillCreate),
+    "projects": (Project, ProjectCreate),
+}
+
+@router.patch("/batch")
+async def apply_profile_batch(
+    request: Request,
+    batch: ProfileBatchRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Apply an ordered list of create/update/delete/reorder operations across
+    all profile sections in a single transaction. Consecutive operations of
+    the same kind on the same section are applied as one bulk statement.
+    """
+    user_id = get_current_user_id(request, db)
+    operations = batch.operations
+
+    # 1. Validate payloads and id ownership before writing anything
+    payloads = []
+    owned_ids = {section: set() for section in BATCH_SECTIONS}
+    deleted_ids = {section: set() for section in BATCH_SECTIONS}  # ids and refs deleted so far
+    for index, op in enumerate(operations):
+        if op.section == "profile":
+            if op.op != "update" or op.data is None:
+                raise HTTPException(status_code=400, detail=f"Operation {index}: profile only supports update with data")
+            schema = ProfileUpdate
+        else:
+            schema = BATCH_SECTIONS[op.section][1]
+            if op.op in ("update", "delete") and op.id is None:
+                raise HTTPException(status_code=400, detail=f"Operation {index}: id is required")
+            if op.op == "reorder" and not op.ids:
+                raise HTTPException(status_code=400, detail=f"Operation {index}: ids are required")
+            targets = ([op.id] if op.id is not None else []) + (op.ids or [])
+            gone = [row_id for row_id in targets if row_id in deleted_ids[op.section]]
+            if gone:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Operation {index}: {op.section} {gone} deleted earlier in this batch"
+                )
+            for row_id in targets:
+                if isinstance(row_id, int):
+                    owned_ids[op.section].add(row_id)
+            if op.op == "delete":
+                deleted_ids[op.section].add(op.id)
+
+        if op.op in ("create", "update"):
+            if op.data is None:
+                raise HTTPException(status_code=400, detail=f"Operation {index}: data is required")
+            try:
+                payloads.append(schema(**op.data).dict(exclude_unset=(op.section == "profile")))
+            except ValidationError as e:
+                raise HTTPException(status_code=400, detail=f"Operation {index}: {e.errors()}")
+        else:
+            payloads.append(None)
+
+    for section, ids in owned_ids.items():
+        if not ids:
+            continue
+        model = BATCH_SECTIONS[section][0]
+        found = {row[0] for row in db.query(model.id).filter(model.user_id == user_id, model.id.in_(ids))}
+        missing = ids - found
+        if missing:
+            raise HTTPException(status_code=404, detail=f"{section} not found: {sorted(missing)}")
+
+    # 2. Apply, grouping consecutive operations of the same kind
+    refs = {}
+    created = []
+
+    def resolve(row_id):
+        if isinstance(row_id, str):
+            if row_id not in refs:
+                raise HTTPException(status_code=400, detail=f"Unknown ref: {row_id}")
+            return refs[row_id]
+        return row_id
+
+    try:
+        indexed = list(zip(operations, payloads))
+        for (kind, section), group in groupby(indexed, key=lambda item: (item[0].op, item[0].section)):
+            group = list(group)
+
+            if section == "profile":
+                profile = db.query(UserProfile).filter(UserProfile.user_id == user_id).first()
+                if not profile:
+                    profile = UserProfile(user_id=user_id)
+                    db.add(profile)
+                for _, payload in group:
+                    for field, value in payload.items():
+                        setattr(profile, field, value)
+                profile.updated_at = datetime.utcnow()
+                continue
+
+            model = BATCH_SECTIONS[section][0]
+
+            if kind == "create":
+                next_order = db.query(func.coalesce(func.max(model.order) + 1, 0)).filter(model.user_id == user_id).scalar()
+                rows = [model(user_id=user_id, order=next_order + i, **payload) for i, (_, payload) in enumerate(group)]
+                db.add_all(rows)
+                db.flush()
+                for (op, _), row in zip(group, rows):
+                    created.append(row.id)
+                    if op.ref:
+                        refs[op.ref] = row.id
+
+            elif kind == "update":
+                db.execute(update(model), [{"id": resolve(op.id), **payload} for op, payload in group])
+
+            elif kind == "delete":
+                ids = [resolve(op.id) for op, _ in group]
+                db.execute(
+                    delete(model).where(model.user_id == user_id, model.id.in_(ids)),
+                    execution_options={"synchronize_session": False}
+                )
+
+            elif kind == "reorder":
+                # Listed rows go first, in the given order; rows a reorder leaves
+                # out keep their relative order after them
+                current = [
+                    row[0] for row in
+                    db.query(model.id).filter(model.user_id == user_id).order_by(model.order, model.id)
+                ]
+                for op, _ in group:
+                    listed = [row_id for row_id in dict.fromkeys(map(resolve, op.ids)) if row_id in current]
+                    moved = set(listed)
+                    current = listed + [row_id for row_id in current if row_id not in moved]
+                db.execute(update(model), [{"id": row_id, "order": i} for i, row_id in enumerate(current)])
+
+        # Bulk statements bypass ORM change tracking
+        mark_profile_dirty(db, user_id)
+        db.commit()
+    except StaleDataError:
+        # A targeted row disappeared mid-batch (e.g. deleted by a concurrent request)
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Profile changed while the batch was applied; reload and retry")
+    except Exception:
+        db.rollback()
+        raise
+
+    return {
+        "success": True,
+        "created": created,
+        "ids": refs,
+        "profile": get_cached_profile_document(db, user_id)
+    }
+
 # Resume History Endpoints
 
 @router.get("/resume-history")
-async def get_resume_history(request: Request, db: Session = Depends(get_db)):
-    """Get all user's resume history"""
+async def get_resume_history(request: Request, response: Response, db: Session = Depends(get_db)):
+    """Get all user's resume history (supports If-None-Match)"""
     user_id = get_current_user_id(request, db)
     
+    etag = make_etag("resume-history", user_id, get_data_version(db, user_id))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(cache_headers(etag))
+    
     resumes = db.query(ResumeHistory).filter(
         ResumeHistory.user_id == user_id
     ).order_by(ResumeHistory.created_at.desc()).all()
@@ -510,10 +601,48 @@ async def delete_resume(
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
     
+    file_path = resume.file_path
     db.delete(resume)
     db.commit()
+    
+    # Saved PDFs are content-addressed and may be shared by several entries
+    still_used = db.query(ResumeHistory.id).filter(ResumeHistory.file_path == file_path).first()
+    if file_path and not still_used:
+        resume_generator.delete_saved_pdf(file_path)
+    
     return {"success": True, "message": "Resume deleted"}
 
+@router.get("/resume-history/{resume_id}/download")
+async def download_resume(
+    request: Request,
+    resume_id: int,
+    db: Session = Depends(get_db)
+):
+    """Download a saved resume PDF"""
+    user_id = get_current_user_id(request, db)
+    
+    resume = db.query(ResumeHistory).filter(
+        ResumeHistory.id == resume_id,
+        ResumeHistory.user_id == user_id
+    ).first()
+    
+    path = resume_generator.saved_path(resume.file_path) if resume else None
+    if not path or not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Resume not found")
+    
+    # Saved files are content-addressed: the file name is a stable validator
+    etag = make_etag("resume", resume.id, os.path.basename(path).removesuffix(".pdf"))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    download_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in resume.title or "resume")
+    return FileResponse(
+        path,
+        media_type="application/pdf",
+        filename=f"{download_name}.pdf",
+        headers=cache_headers(etag)
+    )
+
 @router.put("/resume-history/{resume_id}/favorite")
 async def toggle_favorite(
     request: Request,
@@ -1,38 +1,42 @@
 
 from fastapi import APIRouter, Depends, UploadFile, File, HTTPException
 from app.services.ai_service import ai_service
-from app.services.resume_generator import resume_generator
+from app.services.resume_generator import resume_data_from_document, resume_generator
+from app.services.resume_preview import resume_preview
 from app.schemas.schemas import ScoreRequest, ResumeCreate, ResumeData
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel
+from typing import List, Optional, Literal
 import json
-import os
 
 router = APIRouter()
 
 from fastapi import Request
 from app.db.database import get_db
-from sqlalchemy.orm import Session
-from app.models.models import UserProfile, User, Experience, Education, Skill, Project
-
-# Link User Dependency
-def get_current_user(request: Request, db: Session = Depends(get_db)) -> User:
-    user_data = request.session.get("user")
-    if not user_data:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    
-    email = user_data.get("email")
-    user = db.query(User).filter(User.email == email).first()
-    if not user:
-        # Create user if missing logic (auto-provisioning for demo)
-        user = User(
-            username=user_data.get("name", email.split('@')[0]),
-            email=email
-        )
-        db.add(user)
-        db.commit()
-        db.refresh(user)
-    return user
+from sqlalchemy.orm import Session, defer
+from app.models.models import UserProfile, Experience, Education, Skill, Project, ResumeHistory, RenderJob, SavedJob
+from app.services.render_jobs import render_jobs
+from app.services.resume_export import stream_tailored_zip
+from app.services.profile_cache import get_cached_profile_document
+from app.core.config import get_settings
+from app.api.deps import get_current_user_id
+from app.services.profile_document import get_document_version, get_profile_document, mark_profile_dirty
+from app.core.downloads import download_headers
+from app.core.http_cache import IMMUTABLE, make_etag, etag_matches, not_modified, cache_headers
+
+settings = get_settings()
 
+DOCX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+def _selected_template(request: Request, db: Session) -> str:
+    template_name = "professional" # Default
+
+    if request.session.get("user"):
+        user_id = get_current_user_id(request, db)
+        profile = db.query(UserProfile).filter(UserProfile.user_id == user_id).first()
+        if profile and profile.selected_template:
+            template_name = profile.selected_template
+    return template_name
 
 @router.post("/generate/pdf")
 async def generate_resume_pdf(
@@ -40,26 +44,197 @@ async def generate_resume_pdf(
     request: Request,
     db: Session = Depends(get_db)
 ):
+    """Render the resume in memory and return it (nothing is written to disk)"""
     try:
-        # Determine template
-        template_name = "professional" # Default
-        
-        user_data = request.session.get("user")
-        if user_data:
-            email = user_data.get("email")
-            # Resolve user
-            user = db.query(User).filter(User.email == email).first()
-            if user:
-                # Get profile
-                profile = db.query(UserProfile).filter(UserProfile.user_id == user.id).first()
-                if profile and profile.selected_template:
-                    template_name = profile.selected_template
-        
-        file_path = resume_generator.generate_pdf(data, template_name=template_name)
-        return FileResponse(file_path, media_type='application/pdf', filename=os.path.basename(file_path))
+        template_name = _selected_template(request, db)
+        _, pdf_bytes = await resume_generator.render_pdf(data, template_name=template_name)
+        download_name = f"resume_{data.full_name.replace(' ', '_')}.pdf"
+        return Response(
+            content=pdf_bytes,
+            media_type='application/pdf',
+            headers=download_headers(download_name)
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/generate/docx")
+async def generate_resume_docx(
+    data: ResumeData,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """Render the resume as DOCX (for ATS uploads), sharing the PDF render cache and pool"""
+    try:
+        template_name = _selected_template(request, db)
+        _, docx_bytes = await resume_generator.render_docx(data, template_name=template_name)
+        download_name = f"resume_{data.full_name.replace(' ', '_')}.docx"
+        return Response(
+            content=docx_bytes,
+            media_type=DOCX_MEDIA_TYPE,
+            headers=download_headers(download_name)
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/preview")
+async def preview_resume(request: Request, known: str = "", db: Session = Depends(get_db)):
+    """
+    Live HTML preview of the user's own resume, one fragment per section.
+    `known` is a comma-separated list of section hashes the client already
+    has; those come back with `html: null`. Supports If-None-Match.
+    """
+    user_id = get_current_user_id(request, db)
+    template_name = _selected_template(request, db)
+
+    etag = make_etag(
+        "resume-preview", user_id, get_document_version(db, user_id),
+        template_name, resume_preview.template_version(template_name)[:16]
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    document = get_cached_profile_document(db, user_id)
+    preview = resume_preview.render(
+        resume_data_from_document(document), template_name, known=set(filter(None, known.split(",")))
+    )
+    return JSONResponse(preview, headers=cache_headers(etag))
+
+class SaveResumeRequest(BaseModel):
+    resume: ResumeData
+    title: Optional[str] = None
+    notes: Optional[str] = None
+
+@router.post("/save")
+async def save_resume(
+    body: SaveResumeRequest,
+    request: Request,
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+):
+    """Render (or reuse) the resume PDF and persist it to the user's resume history"""
+    try:
+        template_name = _selected_template(request, db)
+        _, pdf_bytes = await resume_generator.render_pdf(body.resume, template_name=template_name)
+        file_path = resume_generator.save_pdf(pdf_bytes)
+
+        resume = ResumeHistory(
+            user_id=user_id,
+            title=body.title or f"{body.resume.full_name} Resume",
+            template_used=template_name,
+            file_path=file_path,
+            notes=body.notes
+        )
+        db.add(resume)
+        db.commit()
+
+        return {"success": True, "id": resume.id, "file_path": file_path}
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/artifacts/{name}")
+async def get_resume_artifact(name: str, request: Request):
+    """
+    A saved resume PDF by the SHA-256 of its bytes ("<hash>.pdf"). The bytes
+    behind a hash never change, so responses are cacheable forever by browsers
+    and CDNs; supports If-None-Match and Range requests.
+    """
+    path = resume_generator.artifact_path(name)
+    if not path:
+        raise HTTPException(status_code=404, detail="Artifact not found")
+
+    etag = make_etag(name.removesuffix(".pdf"))
+    if etag_matches(request, etag):
+        return not_modified(etag, IMMUTABLE)
+    return FileResponse(path, media_type="application/pdf", headers=cache_headers(etag, IMMUTABLE))
+
+class RenderJobRequest(BaseModel):
+    resume: ResumeData
+    priority: Literal["high", "normal", "low"] = "normal"
+
+def _job_response(job: RenderJob) -> dict:
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        "artifact_url": f"/api/resume/jobs/{job.id}/artifact" if job.status == "done" else None
+    }
+
+def _get_job(request: Request, db: Session, job_id: str, *options) -> RenderJob:
+    job = db.query(RenderJob).options(*options).filter(RenderJob.id == job_id).first()
+    # Jobs created while logged in are only visible to their owner
+    if job and job.user_id is not None:
+        user_id = get_current_user_id(request, db) if request.session.get("user") else None
+        if user_id != job.user_id:
+            job = None
+    if not job:
+        raise HTTPException(status_code=404, detail="Render job not found")
+    return job
+
+@router.post("/jobs", status_code=202)
+async def create_render_job(
+    body: RenderJobRequest,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """Queue a resume render; poll GET /jobs/{job_id} for the result"""
+    template_name = _selected_template(request, db)
+    user_id = get_current_user_id(request, db) if request.session.get("user") else None
+    job = render_jobs.enqueue(db, body.resume, template_name, user_id, priority=body.priority)
+    return _job_response(job)
+
+@router.get("/jobs/{job_id}")
+async def get_render_job(job_id: str, request: Request, db: Session = Depends(get_db)):
+    """Render job status"""
+    return _job_response(_get_job(request, db, job_id, defer(RenderJob.artifact)))
+
+@router.get("/jobs/{job_id}/artifact")
+async def get_render_job_artifact(job_id: str, request: Request, db: Session = Depends(get_db)):
+    """The rendered PDF of a finished job"""
+    job = _get_job(request, db, job_id)
+    if job.status != "done":
+        raise HTTPException(status_code=409, detail=f"Render job is {job.status}")
+
+    download_name = f"resume_{(job.payload or {}).get('full_name', '').replace(' ', '_')}.pdf"
+    return Response(
+        content=job.artifact,
+        media_type='application/pdf',
+        headers=download_headers(download_name)
+    )
+
+class ExportRequest(BaseModel):
+    job_ids: List[int]
+
+@router.post("/export")
+async def export_tailored_resumes(
+    body: ExportRequest,
+    request: Request,
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+):
+    """Stream a zip with one resume per saved job, tailored to that job (entries are sent as they finish)"""
+    job_ids = list(dict.fromkeys(body.job_ids))
+    if not job_ids:
+        raise HTTPException(status_code=400, detail="No saved jobs selected")
+    if len(job_ids) > settings.EXPORT_MAX_JOBS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.EXPORT_MAX_JOBS} jobs per export")
+
+    jobs = db.query(SavedJob).filter(SavedJob.user_id == user_id, SavedJob.id.in_(job_ids)).all()
+    if len(jobs) != len(job_ids):
+        raise HTTPException(status_code=404, detail="Saved job not found")
+    jobs.sort(key=lambda job: job_ids.index(job.id))
+
+    document = get_cached_profile_document(db, user_id)
+    template_name = _selected_template(request, db)
+
+    return StreamingResponse(
+        stream_tailored_zip(user_id, document, jobs, template_name),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="tailored_resumes.zip"'}
+    )
+
 @router.post("/score")
 async def score_resume(request: ScoreRequest):
     """
@@ -119,38 +294,36 @@ async def get_enhancements(resume_data: dict):
          return {"raw_enhancements": result}
 @router.post("/analyze")
 async def analyze_resume(
-    current_user: User = Depends(get_current_user),
+    user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db)
 ):
     """
     Analyzes the user's profile and returns a score + enhanced version.
     """
     # 1. Fetch full profile
-    profile = db.query(UserProfile).filter(UserProfile.user_id == current_user.id).first()
+    profile = db.query(UserProfile).filter(UserProfile.user_id == user_id).first()
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
         
-    experiences = db.query(Experience).filter(Experience.user_id == current_user.id).all()
-    education = db.query(Education).filter(Education.user_id == current_user.id).all()
-    skills = db.query(Skill).filter(Skill.user_id == current_user.id).all()
-    projects = db.query(Project).filter(Project.user_id == current_user.id).all()
+    document = get_profile_document(db, user_id, profile=profile)
+    personal = document["profile"]
 
     # 2. Construct dict
     profile_data = {
         "personal_info": {
-            "full_name": profile.full_name,
-            "email": profile.email,
-            "phone": profile.phone,
-            "location": profile.location,
-            "linkedin": profile.linkedin,
-            "github": profile.github,
-            "portfolio": profile.portfolio
+            "full_name": personal["full_name"],
+            "email": personal["email"],
+            "phone": personal["phone"],
+            "location": personal["location"],
+            "linkedin": personal["linkedin"],
+            "github": personal["github"],
+            "portfolio": personal["portfolio"]
         },
-        "summary": profile.summary,
-        "experience": [{"id": e.id, "title": e.title, "company": e.company, "start_date": e.start_date, "end_date": e.end_date, "description": e.description, "achievements": e.achievements or []} for e in experiences],
-        "education": [{"id": e.id, "degree": e.degree, "institution": e.institution, "graduation_date": e.graduation_date, "gpa": e.gpa} for e in education],
-        "skills": [{"id": s.id, "category": s.category, "skills": s.skills or []} for s in skills],
-        "projects": [{"id": p.id, "name": p.name, "description": p.description, "date": p.date, "technologies": p.technologies or []} for p in projects]
+        "summary": personal["summary"],
+        "experience": [{"id": e["id"], "title": e["title"], "company": e["company"], "start_date": e["start_date"], "end_date": e["end_date"], "description": e["description"], "achievements": e["achievements"]} for e in document["experiences"]],
+        "education": [{"id": e["id"], "degree": e["degree"], "institution": e["institution"], "graduation_date": e["graduation_date"], "gpa": e["gpa"]} for e in document["education"]],
+        "skills": [{"id": s["id"], "category": s["category"], "skills": s["skills"]} for s in document["skills"]],
+        "projects": [{"id": p["id"], "name": p["name"], "description": p["description"], "date": p["date"], "technologies": p["technologies"]} for p in document["projects"]]
     }
 
     # 3. Call AI
@@ -163,7 +336,7 @@ async def analyze_resume(
 @router.post("/apply_enhancements")
 async def apply_enhancements(
     enhanced_data: dict,
-    current_user: User = Depends(get_current_user),
+    user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db)
 ):
     """
@@ -175,12 +348,12 @@ async def apply_enhancements(
     new_profile = enhanced_data["enhanced_profile"]
     
     # Update Summary
-    profile = db.query(UserProfile).filter(UserProfile.user_id == current_user.id).first()
+    profile = db.query(UserProfile).filter(UserProfile.user_id == user_id).first()
     if "summary" in new_profile and new_profile["summary"]:
         profile.summary = new_profile["summary"]
 
     # Update Experience Descriptions
-    db_exps = db.query(Experience).filter(Experience.user_id == current_user.id).all()
+    db_exps = db.query(Experience).filter(Experience.user_id == user_id).order_by(Experience.order, Experience.id).all()
     new_exps = new_profile.get("experience", [])
     
     # Match by index (Assuming AI preserves order)
@@ -190,7 +363,7 @@ async def apply_enhancements(
             # Optional: Update achievements if returned
             
     # Update Project Descriptions
-    db_projs = db.query(Project).filter(Project.user_id == current_user.id).all()
+    db_projs = db.query(Project).filter(Project.user_id == user_id).order_by(Project.order, Project.id).all()
     new_projs = new_profile.get("projects", [])
     
     for i, db_proj in enumerate(db_projs):
@@ -203,7 +376,7 @@ async def apply_enhancements(
 @router.post("/upload")
 async def upload_resume(
     file: UploadFile = File(...),
-    current_user: User = Depends(get_current_user),
+    user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db)
 ):
     """
@@ -230,9 +403,9 @@ async def upload_resume(
              raise HTTPException(status_code=500, detail="Failed to extract data from resume")
 
         # 3. Update Profile Data
-        profile = db.query(UserProfile).filter(UserProfile.user_id == current_user.id).first()
+        profile = db.query(UserProfile).filter(UserProfile.user_id == user_id).first()
         if not profile:
-            profile = UserProfile(user_id=current_user.id)
+            profile = UserProfile(user_id=user_id)
             db.add(profile)
         
         # Helper to update if empty or overwrite? 
@@ -252,15 +425,17 @@ async def upload_resume(
 
         # Clear existing lists to avoid duplicates on re-upload
         # Or should we append? Upload usually implies "Import this resume", so getting a fresh state is safer.
-        db.query(Experience).filter(Experience.user_id == current_user.id).delete()
-        db.query(Education).filter(Education.user_id == current_user.id).delete()
-        db.query(Skill).filter(Skill.user_id == current_user.id).delete()
-        db.query(Project).filter(Project.user_id == current_user.id).delete()
+        db.query(Experience).filter(Experience.user_id == user_id).delete()
+        db.query(Education).filter(Education.user_id == user_id).delete()
+        db.query(Skill).filter(Skill.user_id == user_id).delete()
+        db.query(Project).filter(Project.user_id == user_id).delete()
+        # Bulk deletes bypass ORM change tracking
+        mark_profile_dirty(db, user_id)
         
         # Add Experience
         for exp in extracted_data.get("experience", []):
             db_exp = Experience(
-                user_id=current_user.id,
+                user_id=user_id,
                 title=exp.get("title"),
                 company=exp.get("company"),
                 start_date=exp.get("start_date"),
@@ -273,7 +448,7 @@ async def upload_resume(
         # Add Education
         for edu in extracted_data.get("education", []):
             db_edu = Education(
-                user_id=current_user.id,
+                user_id=user_id,
                 degree=edu.get("degree"),
                 institution=edu.get("institution"),
                 graduation_date=edu.get("graduation_date"),
@@ -284,7 +459,7 @@ async def upload_resume(
         # Add Skills
         for skill_cat in extracted_data.get("skills", []):
             db_skill = Skill(
-                user_id=current_user.id,
+                user_id=user_id,
                 category=skill_cat.get("category"),
                 skills=json.dumps(skill_cat.get("skills", []))
             )
@@ -293,7 +468,7 @@ async def upload_resume(
         # Add Projects
         for proj in extracted_data.get("projects", []):
             db_proj = Project(
-                user_id=current_user.id,
+                user_id=user_id,
                 name=proj.get("name"),
                 description=proj.get("description"),
                 date=proj.get("date"),
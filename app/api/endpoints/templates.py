@@ -1,10 +1,9 @@
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
+from app.core.templates import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
 
 # Sample resume data for previews
 SAMPLE_DATA = {
@@ -111,7 +110,8 @@ class TemplateSelectionRequest(BaseModel):
 from app.db.database import get_db
 from sqlalchemy.orm import Session
 from fastapi import Depends
-from app.models.models import User, UserProfile
+from app.models.models import UserProfile
+from app.api.deps import get_current_user_id
 
 @router.post("/select")
 async def select_template(
@@ -124,24 +124,19 @@ async def select_template(
         raise HTTPException(status_code=400, detail="Invalid template name")
     
     # Get user from session
-    user_data = request.session.get("user")
-    if not user_data:
-        raise HTTPException(status_code=401, detail="Not authenticated")
+    user_id = get_current_user_id(request, db)
     
     # Save to Session (legacy support)
     request.session["selected_template"] = selection.template_name
     
     # SAVE TO DB
-    email = user_data.get("email")
-    user = db.query(User).filter(User.email == email).first()
-    if user:
-        profile = db.query(UserProfile).filter(UserProfile.user_id == user.id).first()
-        if not profile:
-            profile = UserProfile(user_id=user.id)
-            db.add(profile)
-        
-        profile.selected_template = selection.template_name
-        db.commit()
+    profile = db.query(UserProfile).filter(UserProfile.user_id == user_id).first()
+    if not profile:
+        profile = UserProfile(user_id=user_id)
+        db.add(profile)
+    
+    profile.selected_template = selection.template_name
+    db.commit()
     
     return {
         "success": True,
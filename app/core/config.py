@@ -9,6 +9,7 @@ class Settings(BaseSettings):
     # GEMINI AI
     GEMINI_API_KEYS: str = "" # Comma-separated list
     GEMINI_MODEL_NAME: str = "gemini-2.5-flash" 
+    GEMINI_MAX_CONCURRENCY: int = 4  # Gemini requests in flight per process; the rest wait their turn
     
     @property
     def api_keys(self) -> list[str]:
@@ -18,6 +19,51 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str = "sqlite:///./resume_gen.db"
+    AUTO_MIGRATE: bool = True  # Apply pending schema migrations on startup
+
+    # Profile cache
+    PROFILE_CACHE_MAX_ENTRIES: int = 1024
+    PROFILE_CACHE_TTL_SECONDS: int = 300
+    PROFILE_CACHE_REDIS_URL: str = ""  # Optional shared backend for multi-worker deployments
+
+    # Auth
+    USER_ID_CACHE_SIZE: int = 4096  # email -> user id LRU entries
+
+    # Rendered resume cache (in memory, keyed by content hash)
+    RESUME_CACHE_MAX_ENTRIES: int = 512
+    RESUME_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    # PDF backend per template ("name=backend,..."); unlisted templates use xhtml2pdf.
+    # "professional=reportlab" is ~2.5x faster (benchmarks/bench_renderers.py) but is a
+    # hand-written layout that does not follow edits to professional.html, so it is opt-in.
+    RESUME_TEMPLATE_BACKENDS: str = ""
+    RESUME_PREVIEW_CACHE_MAX_ENTRIES: int = 4096  # Rendered HTML preview sections
+    PDF_OPTIMIZE: bool = True  # Recompress / deduplicate generated PDFs (see services/pdf_optimizer.py)
+
+    # Rendered cover letter cache (in memory, keyed by letter text, title, company and date)
+    COVER_LETTER_CACHE_MAX_ENTRIES: int = 256
+    COVER_LETTER_CACHE_MAX_BYTES: int = 16 * 1024 * 1024
+
+    # Jinja templates
+    TEMPLATE_AUTO_RELOAD: bool = False  # Re-check template files on every render (enable while editing them)
+    TEMPLATE_CACHE_DIR: str = ".jinja_cache"  # Compiled template bytecode
+
+    # Render pool (PDF generation)
+    RENDER_POOL_SIZE: int = 2  # Worker processes; 0 renders on a background thread instead
+    RENDER_JOB_WORKERS: int = 4  # Concurrent render jobs taken off the queue
+    RENDER_JOB_RETENTION_SECONDS: int = 3600  # Finished jobs (and their PDFs) are pruned after this
+    EXPORT_RENDERS_PER_USER: int = 2  # Concurrent renders per user during bulk exports (all exports share half the pool)
+    EXPORT_MAX_JOBS: int = 50  # Saved jobs per bulk export
+
+    # Job boards
+    ARBEITNOW_TIMEOUT_SECONDS: float = 5.0  # Per-source deadline; a slower source is left out of the results
+    REMOTIVE_TIMEOUT_SECONDS: float = 5.0
+    JOB_SOURCE_MAX_CONNECTIONS: int = 10  # Pooled keep-alive connections shared by all searches
+    JOB_FEED_TTL_SECONDS: int = 600  # Searches reuse a loaded (indexed) feed for this long
+    JOB_FEED_STALE_SECONDS: int = 3600  # ...then serve it while one background refresh runs
+    JOB_INGEST_ENABLED: bool = True  # Sweep the job boards into the local jobs table in the background
+    JOB_INGEST_INTERVAL_SECONDS: int = 1800
+    JOB_INGEST_MAX_PAGES: int = 20  # Feed pages per source and sweep
+    JOB_LISTING_MAX_AGE_HOURS: int = 72  # Listings no sweep has seen for this long are deleted
 
     # EMAIL / SMTP
     SMTP_SERVER: str = ""
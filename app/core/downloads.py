@@ -0,0 +1,20 @@
+"""
+Helpers for file download responses.
+"""
+import re
+import unicodedata
+from urllib.parse import quote
+
+
+def content_disposition(filename: str, disposition: str = "attachment") -> str:
+    """
+    Content-Disposition value that is safe for any filename: an ASCII-only
+    `filename=` for old clients plus the exact name as RFC 5987 `filename*=`.
+    """
+    fallback = unicodedata.normalize("NFKD", filename).encode("ascii", "ignore").decode("ascii")
+    fallback = re.sub(r"[^A-Za-z0-9._-]+", "_", fallback).strip("_") or "download"
+    return f"{disposition}; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename, safe='')}"
+
+
+def download_headers(filename: str) -> dict:
+    return {"Content-Disposition": content_disposition(filename)}
@@ -0,0 +1,34 @@
+"""
+Helpers for HTTP validators (ETag / If-None-Match).
+"""
+from fastapi import Request
+from fastapi.responses import Response
+
+# Revalidate on every use, but let the browser keep the body for 304s
+REVALIDATE = "private, no-cache"
+# Content-addressed URLs: the body behind them can never change
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag from version components, e.g. make_etag("profile", 3, 17)"""
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match header matches `etag` (weak comparison)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return etag in candidates
+
+
+def not_modified(etag: str, cache_control: str = REVALIDATE) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+def cache_headers(etag: str, cache_control: str = REVALIDATE) -> dict:
+    return {"ETag": etag, "Cache-Control": cache_control}
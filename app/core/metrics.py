@@ -0,0 +1,18 @@
+"""
+Minimal in-process metrics registry.
+
+Services register a zero-argument callable returning a dict of their
+counters; `GET /api/metrics` returns a snapshot of all of them.
+"""
+from typing import Callable, Dict
+
+_sources: Dict[str, Callable[[], dict]] = {}
+
+
+def register(name: str, stats_fn: Callable[[], dict]):
+    """Expose a service's stats under `name`"""
+    _sources[name] = stats_fn
+
+
+def snapshot() -> dict:
+    return {name: stats_fn() for name, stats_fn in _sources.items()}
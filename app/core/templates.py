@@ -0,0 +1,38 @@
+"""
+Shared Jinja2 environment for page views and resume templates.
+
+One environment means one compiled-template cache for the whole process.
+Compiled bytecode is also persisted in TEMPLATE_CACHE_DIR, so restarted
+workers (and render pool processes) load templates without recompiling,
+and `warmup()` compiles everything at startup so the first request after a
+deploy isn't the slow one. Templates are only re-checked for changes on
+disk when TEMPLATE_AUTO_RELOAD is on (local development).
+"""
+import os
+from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
+from app.core.config import get_settings
+
+settings = get_settings()
+
+TEMPLATE_DIR = "app/templates"
+
+os.makedirs(settings.TEMPLATE_CACHE_DIR, exist_ok=True)
+
+env = Environment(
+    loader=FileSystemLoader(TEMPLATE_DIR),
+    bytecode_cache=FileSystemBytecodeCache(settings.TEMPLATE_CACHE_DIR),
+    auto_reload=settings.TEMPLATE_AUTO_RELOAD,
+    autoescape=True,
+    cache_size=-1,  # never evict compiled templates
+)
+
+templates = Jinja2Templates(env=env)
+
+
+def warmup(prefix: str = "") -> int:
+    """Compile every .html template (under `prefix`) and return how many were loaded"""
+    names = [name for name in env.list_templates(extensions=["html"]) if name.startswith(prefix)]
+    for name in names:
+        env.get_template(name)
+    return len(names)
@@ -2,6 +2,8 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
 from app.core.config import get_settings
 from app.models.models import Base
+from app.db.migrations import run_migrations
+from app.services import profile_document, data_version
 
 settings = get_settings()
 
@@ -9,6 +11,9 @@ engine = create_engine(
     settings.DATABASE_URL, connect_args={"check_same_thread": False}
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Order matters: documents are rebuilt before data versions are bumped
+profile_document.register_session_events(SessionLocal)
+data_version.register_session_events(SessionLocal)
 
 def get_db():
     """Dependency to get database session"""
@@ -19,6 +24,8 @@ def get_db():
         db.close()
 
 def init_db():
-    """Initialize database and create all tables"""
+    """Initialize database, create all tables and apply pending migrations"""
     Base.metadata.create_all(bind=engine)
+    if settings.AUTO_MIGRATE:
+        run_migrations(engine)
     print("✓ Database initialized with all tables")
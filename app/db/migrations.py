@@ -0,0 +1,156 @@
+"""
+Versioned schema migrations.
+
+Each migration is a (version, name, function) entry in MIGRATIONS. Applied
+versions are recorded in the `schema_migrations` table, so every migration
+runs exactly once per database, in order, inside its own transaction.
+
+Run automatically on startup (see `init_db`) or from the command line:
+
+    python -m app.db.migrations            # apply pending migrations
+    python -m app.db.migrations status     # list applied / pending versions
+"""
+from datetime import datetime
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+
+def _add_column_if_missing(conn: Connection, table: str, column: str, ddl_type: str):
+    columns = [c["name"] for c in inspect(conn).get_columns(table)]
+    if column not in columns:
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl_type}"))
+
+
+# --- Migrations ---
+
+def _0001_profile_languages_hobbies(conn: Connection):
+    """Add languages/hobbies to user_profiles (was migrate_add_languages_hobbies.py)"""
+    _add_column_if_missing(conn, "user_profiles", "languages", "TEXT")
+    _add_column_if_missing(conn, "user_profiles", "hobbies", "TEXT")
+
+
+def _0002_hot_path_indexes(conn: Connection):
+    """Index the per-user / per-session lookups used by every request"""
+    # The unique (user_id, url) index fails if duplicates already exist,
+    # so keep the oldest row of each duplicate group first.
+    conn.execute(text(
+        "DELETE FROM saved_jobs WHERE id NOT IN "
+        "(SELECT MIN(id) FROM saved_jobs GROUP BY user_id, url)"
+    ))
+
+    statements = [
+        'CREATE INDEX IF NOT EXISTS ix_experiences_user_id_order ON experiences (user_id, "order")',
+        'CREATE INDEX IF NOT EXISTS ix_education_user_id_order ON education (user_id, "order")',
+        'CREATE INDEX IF NOT EXISTS ix_skills_user_id_order ON skills (user_id, "order")',
+        'CREATE INDEX IF NOT EXISTS ix_projects_user_id_order ON projects (user_id, "order")',
+        "CREATE INDEX IF NOT EXISTS ix_chat_sessions_user_id ON chat_sessions (user_id)",
+        "CREATE INDEX IF NOT EXISTS ix_chat_messages_session_id_timestamp ON chat_messages (session_id, timestamp)",
+        "CREATE INDEX IF NOT EXISTS ix_resume_history_user_id_created_at ON resume_history (user_id, created_at)",
+        "CREATE UNIQUE INDEX IF NOT EXISTS ux_saved_jobs_user_id_url ON saved_jobs (user_id, url)",
+    ]
+    for statement in statements:
+        conn.execute(text(statement))
+
+
+def _0003_profile_document(conn: Connection):
+    """Add the materialized profile document and its version to user_profiles"""
+    _add_column_if_missing(conn, "user_profiles", "document", "JSON")
+    _add_column_if_missing(conn, "user_profiles", "document_version", "INTEGER NOT NULL DEFAULT 0")
+
+
+def _0004_user_data_version(conn: Connection):
+    """Add the per-user data version used for ETags"""
+    _add_column_if_missing(conn, "users", "data_version", "INTEGER NOT NULL DEFAULT 0")
+
+
+
+def _0005_resume_artifact_urls(conn: Connection):
+    """Point content-hash named resume PDFs at their immutable artifact URL"""
+    # '/static/generated_resumes/' is 26 characters; only <64 hex>.pdf names are
+    # content-addressed (older name-based files keep their static URL)
+    conn.execute(text(
+        "UPDATE resume_history "
+        "SET file_path = '/api/resume/artifacts/' || substr(file_path, 27) "
+        "WHERE file_path LIKE '/static/generated_resumes/%.pdf' "
+        "AND length(file_path) = 26 + 64 + 4 "
+        "AND substr(file_path, 27, 64) NOT GLOB '*[^0-9a-f]*'"
+    ))
+
+
+
+def _0006_cover_letter_cache_key(conn: Connection):
+    """Add the result cache key to cover_letters"""
+    _add_column_if_missing(conn, "cover_letters", "cache_key", "VARCHAR")
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_cover_letters_user_id_cache_key ON cover_letters (user_id, cache_key)"
+    ))
+
+
+MIGRATIONS = [
+    (1, "profile_languages_hobbies", _0001_profile_languages_hobbies),
+    (2, "hot_path_indexes", _0002_hot_path_indexes),
+    (3, "profile_document", _0003_profile_document),
+    (4, "user_data_version", _0004_user_data_version),
+    (5, "resume_artifact_urls", _0005_resume_artifact_urls),
+    (6, "cover_letter_cache_key", _0006_cover_letter_cache_key),
+]
+
+
+# --- Runner ---
+
+def _ensure_version_table(engine: Engine):
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "version INTEGER PRIMARY KEY, "
+            "name VARCHAR NOT NULL, "
+            "applied_at DATETIME NOT NULL)"
+        ))
+
+
+def applied_versions(engine: Engine) -> set[int]:
+    """Return the set of migration versions already applied to the database"""
+    _ensure_version_table(engine)
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT version FROM schema_migrations"))
+        return {row[0] for row in rows}
+
+
+def run_migrations(engine: Engine) -> list[int]:
+    """Apply all pending migrations in order. Returns the versions applied."""
+    done = applied_versions(engine)
+    applied = []
+
+    for version, name, migrate in MIGRATIONS:
+        if version in done:
+            continue
+        with engine.begin() as conn:
+            migrate(conn)
+            conn.execute(
+                text("INSERT INTO schema_migrations (version, name, applied_at) VALUES (:v, :n, :t)"),
+                {"v": version, "n": name, "t": datetime.utcnow()}
+            )
+        print(f"✓ Applied migration {version:04d}_{name}")
+        applied.append(version)
+
+    return applied
+
+
+if __name__ == "__main__":
+    import argparse
+    from app.db.database import engine
+    from app.models.models import Base
+
+    parser = argparse.ArgumentParser(description="Database schema migrations")
+    parser.add_argument("command", nargs="?", default="upgrade", choices=["upgrade", "status"])
+    args = parser.parse_args()
+
+    if args.command == "status":
+        done = applied_versions(engine)
+        for version, name, _ in MIGRATIONS:
+            state = "applied" if version in done else "pending"
+            print(f"{version:04d}_{name}: {state}")
+    else:
+        Base.metadata.create_all(bind=engine)
+        if not run_migrations(engine):
+            print("✓ Database schema is up to date")
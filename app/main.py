@@ -1,11 +1,16 @@
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
 from app.db.database import init_db
 from starlette.middleware.sessions import SessionMiddleware
 from app.api.endpoints import chat, resume, jobs, auth, cover_letter, templates, profile
 from app.api import views
+from app.core import metrics
+from app.core import templates as page_templates
+from app.services.render_pool import render_pool
+from app.services.render_jobs import render_jobs
+from app.services.job_service import job_service
+from app.services.job_ingestion import job_ingestion
 import os
 
 app = FastAPI(title="Resume Generator Chatbot")
@@ -27,13 +32,24 @@ app.add_middleware(
 @app.on_event("startup")
 def on_startup():
     init_db()
+    print(f"✓ Precompiled {page_templates.warmup()} templates")
+    render_pool.start()
+
+@app.on_event("startup")
+async def start_background_workers():
+    render_jobs.start()
+    job_ingestion.start()
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    await render_jobs.shutdown()
+    await job_ingestion.shutdown()
+    render_pool.shutdown()
+    await job_service.close()
 
 # Mount static files
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
-# Templates
-templates_jinja = Jinja2Templates(directory="app/templates")
-
 # Routers (API)
 app.include_router(chat.router, prefix="/api/chat", tags=["Chat"])
 app.include_router(resume.router, prefix="/api/resume", tags=["Resume"])
@@ -49,3 +65,8 @@ app.include_router(views.router, tags=["Frontend"])
 @app.get("/")
 def read_root():
     return {"message": "Welcome to Resume Generator Chatbot API"}
+
+@app.get("/api/metrics", tags=["Metrics"])
+def read_metrics():
+    """In-process cache and service counters"""
+    return metrics.snapshot()
@@ -1,5 +1,5 @@
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Float, Boolean, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Float, Boolean, JSON, Index, LargeBinary
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
@@ -12,6 +12,7 @@ class User(Base):
     id = Column(Integer, primary_key=True, index=True)
     username = Column(String, unique=True, index=True)
     email = Column(String, unique=True, index=True)
+    data_version = Column(Integer, default=0, nullable=False)  # Bumped on any change to the user's data
     created_at = Column(DateTime, default=datetime.utcnow)
     
     resumes = relationship("Resume", back_populates="user")
@@ -40,6 +41,7 @@ class Resume(Base):
 
 class ChatSession(Base):
     __tablename__ = "chat_sessions"
+    __table_args__ = (Index("ix_chat_sessions_user_id", "user_id"),)
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -51,6 +53,7 @@ class ChatSession(Base):
 
 class ChatMessage(Base):
     __tablename__ = "chat_messages"
+    __table_args__ = (Index("ix_chat_messages_session_id_timestamp", "session_id", "timestamp"),)
     
     id = Column(Integer, primary_key=True, index=True)
     session_id = Column(Integer, ForeignKey("chat_sessions.id"))
@@ -87,6 +90,10 @@ class UserProfile(Base):
     # Template Selection
     selected_template = Column(String, default="professional")
     
+    # Materialized profile document (see app/services/profile_document.py)
+    document = Column(JSON, nullable=True)
+    document_version = Column(Integer, default=0, nullable=False)
+    
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -96,6 +103,7 @@ class UserProfile(Base):
 
 class Experience(Base):
     __tablename__ = "experiences"
+    __table_args__ = (Index("ix_experiences_user_id_order", "user_id", "order"),)
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -117,6 +125,7 @@ class Experience(Base):
 
 class Education(Base):
     __tablename__ = "education"
+    __table_args__ = (Index("ix_education_user_id_order", "user_id", "order"),)
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -135,6 +144,7 @@ class Education(Base):
 
 class Skill(Base):
     __tablename__ = "skills"
+    __table_args__ = (Index("ix_skills_user_id_order", "user_id", "order"),)
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -150,6 +160,7 @@ class Skill(Base):
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (Index("ix_projects_user_id_order", "user_id", "order"),)
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -168,6 +179,7 @@ class Project(Base):
 
 class ResumeHistory(Base):
     __tablename__ = "resume_history"
+    __table_args__ = (Index("ix_resume_history_user_id_created_at", "user_id", "created_at"),)
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -185,6 +197,7 @@ class ResumeHistory(Base):
 
 class SavedJob(Base):
     __tablename__ = "saved_jobs"
+    __table_args__ = (Index("ux_saved_jobs_user_id_url", "user_id", "url", unique=True),)
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -207,3 +220,61 @@ class SavedJob(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+
+class JobListing(Base):
+    __tablename__ = "jobs"  # Filled by services/job_ingestion.py
+    __table_args__ = (Index("ix_jobs_source_last_seen_at", "source", "last_seen_at"),)
+    
+    id = Column(Integer, primary_key=True, index=True)
+    url = Column(String, unique=True, nullable=False)
+    source = Column(String, nullable=False)  # arbeitnow, remotive
+    
+    title = Column(String)
+    company = Column(String)
+    location = Column(String)
+    remote = Column(Boolean, default=False)
+    description = Column(Text)  # Full description (HTML as published)
+    tags = Column(JSON)  # Tags / category
+    posted_at = Column(DateTime, nullable=True)  # As reported by the source
+    
+    first_seen_at = Column(DateTime, default=datetime.utcnow)
+    last_seen_at = Column(DateTime, default=datetime.utcnow)  # Last sweep that still listed it
+
+
+class CoverLetter(Base):
+    __tablename__ = "cover_letters"
+    __table_args__ = (
+        Index("ix_cover_letters_user_id_created_at", "user_id", "created_at"),
+        Index("ix_cover_letters_user_id_cache_key", "user_id", "cache_key"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"))
+    
+    job_title = Column(String)
+    company_name = Column(String)
+    tone = Column(String)
+    content = Column(Text)  # Final generated text
+    cache_key = Column(String, nullable=True)  # See services/cover_letter_cache.py
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class RenderJob(Base):
+    __tablename__ = "render_jobs"
+    __table_args__ = (Index("ix_render_jobs_user_id_content_key", "user_id", "content_key"),)
+    
+    id = Column(String, primary_key=True)  # uuid4 hex
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)  # None for anonymous renders
+    
+    content_key = Column(String, nullable=False)  # Content hash of context + template
+    template_used = Column(String)
+    payload = Column(JSON)  # ResumeData, kept so queued jobs survive a restart
+    priority = Column(Integer, default=1)  # 0 = high, 1 = normal, 2 = low
+    status = Column(String, default="queued")  # queued, running, done, failed
+    error = Column(Text, nullable=True)
+    artifact = Column(LargeBinary, nullable=True)  # Rendered PDF
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
@@ -40,6 +40,8 @@ class ResumeData(BaseModel):
     experience: List[dict] = []
     skills: List[str] = []
     projects: List[dict] = []
+    languages: List[str] = []
+    hobbies: List[str] = []
 
 class ResumeCreate(BaseModel):
     title: str
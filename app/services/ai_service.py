@@ -8,6 +8,7 @@ settings = get_settings()
 
 from pydantic import BaseModel, Field
 from typing import List, Optional
+import asyncio
 import json
 import random
 
@@ -78,6 +79,8 @@ class AIService:
     def __init__(self):
         self.api_keys = settings.api_keys
         self.model_name = settings.GEMINI_MODEL_NAME
+        # Admission limit shared by every call made through this instance
+        self.admission = asyncio.Semaphore(settings.GEMINI_MAX_CONCURRENCY)
         
         if not self.api_keys:
             print("WARNING: GEMINI_API_KEYs not found. AI features will not work.")
@@ -108,11 +111,17 @@ class AIService:
 
     async def _execute_with_retry(self, operation_coroutine_func):
         """
-        Executes a function with automatic API key rotation and retries.
+        Executes a function with automatic API key rotation and retries,
+        once a slot under the admission limit is free.
         """
         if not self.api_keys:
             return {"error": "No API Keys configured"}
 
+        async with self.admission:
+            return await self._rotate_keys(operation_coroutine_func)
+
+    async def _rotate_keys(self, operation_coroutine_func):
+
         # Shuffle keys (copy to avoid side effects)
         keys = list(self.api_keys)
         random.shuffle(keys)
@@ -345,10 +354,13 @@ class AIService:
             return '{"score": 0, "strengths": [], "weaknesses": ["Error analyzing resume"], "improvements": []}'
 
 
-    async def generate_content(self, prompt: str) -> str:
+    async def generate_text(self, prompt: str) -> str:
         """
-        Generic content generation method for various use cases (e.g., cover letters).
+        Generic content generation; unlike generate_content, failures raise.
         """
+        if not self.api_keys:
+            raise RuntimeError("No API Keys configured")
+
         async def _attempt_gen_generic(client):
             response = await client.aio.models.generate_content(
                 model=self.model_name,
@@ -356,11 +368,69 @@ class AIService:
             )
             return response.text
 
+        return await self._execute_with_retry(_attempt_gen_generic)
+
+    async def generate_content(self, prompt: str) -> str:
+        """
+        Generic content generation method for various use cases (e.g., cover letters).
+        """
         try:
-            return await self._execute_with_retry(_attempt_gen_generic)
+            return await self.generate_text(prompt)
         except Exception as e:
             return f"Error generating content: {str(e)}"
 
+    async def generate_content_stream(self, prompt: str):
+        """
+        Streaming variant of generate_content: yields text chunks as the model
+        produces them. Keys are rotated only until the first chunk arrives;
+        after that an error ends the stream. Raises if every key fails.
+        """
+        if not self.api_keys:
+            raise RuntimeError("No API Keys configured")
+
+        # The admission slot is held until the stream ends
+        async with self.admission:
+            chunks = self._stream_with_rotation(prompt)
+            try:
+                async for text in chunks:
+                    yield text
+            finally:
+                await chunks.aclose()
+
+    async def _stream_with_rotation(self, prompt: str):
+        keys = list(self.api_keys)
+        random.shuffle(keys)
+
+        stream, first, last_error = None, None, None
+        for key in keys:
+            try:
+                client = genai.Client(api_key=key)
+                stream = await client.aio.models.generate_content_stream(
+                    model=self.model_name,
+                    contents=prompt
+                )
+                first = await stream.__anext__()
+                break
+            except StopAsyncIteration:
+                return
+            except Exception as e:
+                print(f"Key {key[:5]}... failed with error: {e}. Rotating...")
+                last_error = e
+                stream = None
+        if stream is None:
+            print("All API keys failed.")
+            raise last_error
+
+        try:
+            if first.text:
+                yield first.text
+            async for chunk in stream:
+                if chunk.text:
+                    yield chunk.text
+        finally:
+            # Also runs when the consumer stops early (client disconnected)
+            await stream.aclose()
+
     async def suggest_jobs(self, profile_context: str) -> dict:
         """
         Suggests job titles and companies based on profile.
@@ -0,0 +1,85 @@
+"""
+Durable cache of generated cover letters.
+
+Every generated letter is stored in `cover_letters` with a cache key built
+from everything that shapes the prompt: the candidate context (the user's
+profile document version, or a hash of the context they pasted), the job
+description (whitespace/case normalized, hashed), job title, company and
+tone. A later request with the same key is answered from the table instead
+of calling Gemini again, across restarts; `regenerate=True` skips the lookup.
+Editing the profile bumps its document version, so stale letters are never
+served.
+"""
+import hashlib
+from threading import Lock
+from sqlalchemy.orm import Session
+from app.core import metrics
+from app.models.models import CoverLetter
+from app.services.profile_document import get_versioned_profile_document
+
+
+def _normalize(text: str | None) -> str:
+    return " ".join((text or "").split()).casefold()
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def cover_letter_key(db: Session, user_id: int, job_title: str, company_name: str,
+                     job_description: str, tone: str, resume_context: str | None = None) -> str:
+    """Cache key for a cover letter request"""
+    if resume_context and resume_context.strip():
+        source = "context:" + _digest(resume_context.strip())
+    else:
+        # Materializes the document on first use, so the version is stable from here on
+        source = f"profile:{get_versioned_profile_document(db, user_id)[0]}"
+
+    return _digest("\x1f".join([
+        source,
+        _digest(_normalize(job_description)),
+        _normalize(job_title),
+        _normalize(company_name),
+        tone,
+    ]))
+
+
+class CoverLetterCacheStats:
+    def __init__(self):
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+
+    def count(self, outcome: str):
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,  # regenerate=True
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+cover_letter_cache_stats = CoverLetterCacheStats()
+metrics.register("cover_letter_results", cover_letter_cache_stats.stats)
+
+
+def get_cached_cover_letter(db: Session, user_id: int, cache_key: str, regenerate: bool = False) -> CoverLetter | None:
+    """Most recent stored letter for `cache_key`, unless `regenerate` is set"""
+    if regenerate:
+        cover_letter_cache_stats.count("bypassed")
+        return None
+
+    cover_letter = (
+        db.query(CoverLetter)
+        .filter(CoverLetter.user_id == user_id, CoverLetter.cache_key == cache_key)
+        .order_by(CoverLetter.created_at.desc(), CoverLetter.id.desc())
+        .first()
+    )
+    cover_letter_cache_stats.count("hits" if cover_letter else "misses")
+    return cover_letter
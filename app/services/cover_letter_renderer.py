@@ -0,0 +1,82 @@
+"""
+Cover letter PDF rendering (ReportLab).
+
+`render_cover_letter_pdf` is a module-level function so it can run in the
+render pool's worker processes; its paragraph styles are built once per
+process. `cover_letter_pdfs` (used by the routes) renders through the pool
+and caches the output under a hash of everything that ends up in the PDF.
+"""
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+from reportlab.lib.enums import TA_LEFT
+from xml.sax.saxutils import escape
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+from app.core import metrics
+from app.services.pdf_optimizer import render_optimized
+import hashlib
+import io
+import json
+
+settings = get_settings()
+
+# Custom style for cover letter (built once per process)
+_COVER_LETTER = ParagraphStyle(
+    'CoverLetter',
+    parent=getSampleStyleSheet()['Normal'],
+    fontSize=11,
+    leading=16,
+    alignment=TA_LEFT,
+    spaceAfter=12,
+)
+
+
+def render_cover_letter_pdf(cover_letter: str, date_text: str, title: str = "") -> bytes:
+    """Render the cover letter text (paragraphs separated by blank lines) to PDF bytes"""
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter,
+                          rightMargin=72, leftMargin=72,
+                          topMargin=72, bottomMargin=18,
+                          title=title)
+
+    # Add date
+    elements = [Paragraph(escape(date_text), _COVER_LETTER), Spacer(1, 0.2*inch)]
+
+    # Split cover letter into paragraphs
+    for para in cover_letter.split('\n\n'):
+        if para.strip():
+            elements.append(Paragraph(escape(para.strip()), _COVER_LETTER))
+            elements.append(Spacer(1, 0.15*inch))
+
+    # Build PDF
+    doc.build(elements)
+    return buffer.getvalue()
+
+
+class CoverLetterPdfService:
+    def __init__(self):
+        # content hash -> PDF bytes
+        self.cache = TTLCache(
+            max_entries=settings.COVER_LETTER_CACHE_MAX_ENTRIES,
+            max_bytes=settings.COVER_LETTER_CACHE_MAX_BYTES
+        )
+
+    def cache_key(self, cover_letter: str, job_title: str, company_name: str, date_text: str) -> str:
+        canonical = json.dumps([cover_letter, job_title, company_name, date_text], separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    async def render(self, cover_letter: str, job_title: str, company_name: str, date_text: str) -> bytes:
+        """Cover letter PDF, rendered in the render pool unless an identical one is cached"""
+        key = self.cache_key(cover_letter, job_title, company_name, date_text)
+        pdf_bytes = self.cache.get(key)
+        if pdf_bytes is None:
+            title = " - ".join(filter(None, ["Cover Letter", job_title, company_name]))
+            pdf_bytes = await render_optimized(render_cover_letter_pdf, cover_letter, date_text, title)
+            self.cache.set(key, pdf_bytes)
+        return pdf_bytes
+
+
+cover_letter_pdfs = CoverLetterPdfService()
+metrics.register("cover_letter_cache", cover_letter_pdfs.cache.stats)
@@ -0,0 +1,60 @@
+"""
+Per-user data version.
+
+`User.data_version` is bumped in the same transaction as any change to the
+user's profile rows, resume history or saved jobs. Read endpoints derive
+strong ETags from it, so conditional requests can be answered with a single
+primary-key read instead of loading the data itself.
+"""
+from itertools import chain
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+from app.models.models import User, ResumeHistory, SavedJob
+from app.services.profile_document import PROFILE_MODELS
+
+VERSIONED_MODELS = PROFILE_MODELS + (ResumeHistory, SavedJob)
+
+_CHANGED_KEY = "data_version_changed"
+
+
+def mark_data_changed(db: Session, user_id: int):
+    """Bump the user's data version on the next commit (for bulk statements)"""
+    db.info.setdefault(_CHANGED_KEY, set()).add(user_id)
+
+
+def get_data_version(db: Session, user_id: int) -> int:
+    return db.query(User.data_version).filter(User.id == user_id).scalar() or 0
+
+
+# --- Session events ---
+
+def _track_changes(session: Session, flush_context, instances):
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, VERSIONED_MODELS) and obj.user_id is not None:
+            mark_data_changed(session, obj.user_id)
+
+
+def _bump_versions(session: Session):
+    session.flush()
+    user_ids = session.info.pop(_CHANGED_KEY, None)
+    if user_ids:
+        session.execute(
+            update(User)
+            .where(User.id.in_(user_ids))
+            .values(data_version=User.data_version + 1),
+            execution_options={"synchronize_session": False}
+        )
+
+
+def _discard_changes(session: Session, previous_transaction=None):
+    session.info.pop(_CHANGED_KEY, None)
+
+
+def register_session_events(session_factory):
+    """
+    Must be registered after the profile document events, so the document
+    rebuild (which touches UserProfile) is flushed before versions are bumped.
+    """
+    event.listen(session_factory, "before_flush", _track_changes)
+    event.listen(session_factory, "before_commit", _bump_versions)
+    event.listen(session_factory, "after_soft_rollback", _discard_changes)
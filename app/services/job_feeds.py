@@ -0,0 +1,126 @@
+"""
+In-memory cache of job board feeds.
+
+Each source's parsed feed (an indexed job list) is kept for JOB_FEED_TTL_SECONDS. After that the
+cached list is still served, for up to JOB_FEED_STALE_SECONDS more, while a
+single background refresh fetches a new one (stale-while-revalidate). Only a
+cold or too-old feed makes a search wait for the download, and concurrent
+searches share that download instead of each starting their own. A failed
+refresh keeps the previous list.
+"""
+import asyncio
+import time
+from functools import partial
+from threading import Lock
+from typing import Awaitable, Callable, Optional, Sequence
+from app.core.config import get_settings
+from app.core import metrics
+
+settings = get_settings()
+
+Fetcher = Callable[[], Awaitable[Optional[Sequence]]]
+
+
+class JobFeedCache:
+    def __init__(self, ttl_seconds: float = settings.JOB_FEED_TTL_SECONDS,
+                 stale_seconds: float = settings.JOB_FEED_STALE_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self._feeds = {}  # source -> (fetched_at, jobs)
+        self._refreshing = {}  # source -> in-flight refresh task
+        self._lock = Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    async def _refresh(self, source: str, fetch: Fetcher) -> Sequence:
+        self._count("refreshes")
+        try:
+            jobs = await fetch()
+        except Exception as e:
+            print(f"❌ {source} feed refresh failed: {e}")
+            jobs = None
+
+        if jobs is None:
+            self._count("refresh_failures")
+            previous = self._feeds.get(source)
+            return previous[1] if previous else []
+
+        self._feeds[source] = (time.monotonic(), jobs)
+        print(f"✓ {source} feed refreshed ({len(jobs)} jobs)")
+        return jobs
+
+    def _start_refresh(self, source: str, fetch: Fetcher) -> asyncio.Task:
+        """The in-flight refresh for `source`, starting one if none is running"""
+        task = self._refreshing.get(source)
+        if task is None or task.done():
+            task = asyncio.create_task(self._refresh(source, fetch))
+            self._refreshing[source] = task
+            task.add_done_callback(partial(self._refresh_done, source))
+        return task
+
+    def _refresh_done(self, source: str, task: asyncio.Task):
+        if self._refreshing.get(source) is task:
+            del self._refreshing[source]
+
+    async def get(self, source: str, fetch: Fetcher) -> Sequence:
+        """Jobs for `source`; `fetch` downloads the feed (None on failure)"""
+        entry = self._feeds.get(source)
+        if entry is not None:
+            fetched_at, jobs = entry
+            age = time.monotonic() - fetched_at
+            if age < self.ttl_seconds:
+                self._count("hits")
+                return jobs
+            if age < self.ttl_seconds + self.stale_seconds:
+                self._count("stale_hits")
+                self._start_refresh(source, fetch)
+                return jobs
+
+        self._count("misses")
+        # shield: a cancelled search must not cancel the download other searches await
+        return await asyncio.shield(self._start_refresh(source, fetch))
+
+    def put(self, source: str, jobs: Sequence):
+        """Replace the cached feed of `source` (e.g. right after ingesting it)"""
+        self._feeds[source] = (time.monotonic(), jobs)
+
+    def invalidate(self, source: str | None = None):
+        if source is None:
+            self._feeds.clear()
+        else:
+            self._feeds.pop(source, None)
+
+    async def close(self):
+        tasks = list(self._refreshing.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._refreshing.clear()
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "refreshing": sorted(self._refreshing),
+            "feeds": {
+                source: {"jobs": len(jobs), "age_seconds": round(now - fetched_at, 1)}
+                for source, (fetched_at, jobs) in list(self._feeds.items())
+            },
+        }
+
+
+job_feeds = JobFeedCache()
+metrics.register("job_feeds", job_feeds.stats)
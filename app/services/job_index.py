@@ -0,0 +1,202 @@
+"""
+Inverted index and BM25 ranking over job listings.
+
+A `JobSegment` indexes one source's listings. It is built once whenever that
+source's feed is refreshed, so queries never re-tokenize the corpus:
+titles, tags/category and descriptions (HTML stripped) are lowercased and
+tokenized up front into postings (term -> [(doc, weighted tf)]), with title
+and tag matches weighted above description matches. Each segment also keeps
+location facets (location token -> docs, plus the set of remote docs) so a
+location filter is a set lookup rather than a scan.
+
+`search` scores every segment against corpus-wide statistics (document
+count, document frequencies, average length), so results from different
+sources are ranked on one BM25 scale.
+"""
+import heapq
+import html
+import math
+import re
+import time
+from collections import defaultdict
+from threading import Lock
+from typing import Dict, Iterable, List, Sequence
+from app.core import metrics
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Term-frequency weight per field
+FIELD_WEIGHTS = {"title": 3.0, "tags": 2.0, "body": 1.0}
+
+# Listings in these locations get their score boosted (US, India, Remote)
+PREFERRED_LOCATIONS = {"united states", "usa", "us", "india", "remote", "worldwide", "anywhere"}
+PREFERRED_BOOST = 1.2
+
+# Fields returned to callers
+PUBLIC_FIELDS = ("title", "company", "location", "url", "remote", "description", "source")
+
+STOP_WORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is",
+    "of", "on", "or", "our", "the", "to", "we", "with", "you", "your",
+}
+
+_TAG = re.compile(r"<[^>]+>")
+# Keeps tokens like c++, c#, node.js and .net intact
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*|\.net")
+
+
+def tokenize(text: str | None) -> List[str]:
+    """Lowercased, HTML-stripped tokens without stop words; plurals folded to the singular"""
+    if not text:
+        return []
+    text = html.unescape(_TAG.sub(" ", text)).lower()
+    tokens = []
+    for token in _TOKEN.findall(text):
+        if token in STOP_WORDS:
+            continue
+        if len(token) > 3 and token.isalnum() and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def _location_tokens(location: str | None) -> List[str]:
+    return re.findall(r"[a-z0-9]+", (location or "").lower())
+
+
+class JobSegment:
+    """Index over one source's listings; each job carries `tags` and `body` besides PUBLIC_FIELDS"""
+
+    def __init__(self, jobs: Sequence[Dict]):
+        started = time.perf_counter()
+        self.jobs = list(jobs)
+        self.postings = defaultdict(list)  # term -> [(doc id, weighted tf)]
+        self.lengths = []
+        self.locations = defaultdict(set)  # location token -> doc ids
+        self.remote = set()
+        self.preferred = set()
+
+        for doc_id, job in enumerate(self.jobs):
+            frequencies = defaultdict(float)
+            fields = {
+                "title": job.get("title"),
+                "tags": " ".join(job.get("tags") or []),
+                "body": job.get("body"),
+            }
+            for field, text in fields.items():
+                for token in tokenize(text):
+                    frequencies[token] += FIELD_WEIGHTS[field]
+            for term, tf in frequencies.items():
+                self.postings[term].append((doc_id, tf))
+            self.lengths.append(sum(frequencies.values()))
+
+            location = (job.get("location") or "").lower()
+            location_tokens = _location_tokens(location)
+            for token in location_tokens:
+                self.locations[token].add(doc_id)
+            if job.get("remote") or "remote" in location_tokens:
+                self.remote.add(doc_id)
+            if PREFERRED_LOCATIONS.intersection(location_tokens) or "united states" in location:
+                self.preferred.add(doc_id)
+
+        self.total_length = sum(self.lengths)
+        index_stats.record_build(time.perf_counter() - started)
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def document_frequency(self, term: str) -> int:
+        return len(self.postings.get(term, ()))
+
+    def at_location(self, location: str) -> set | None:
+        """Doc ids at `location` (every location token matches); None = no filter"""
+        tokens = _location_tokens(location)
+        if not tokens:
+            return None
+        return set.intersection(*(self.locations.get(token, set()) for token in tokens))
+
+    def public(self, doc_id: int) -> Dict:
+        job = self.jobs[doc_id]
+        return {field: job.get(field) for field in PUBLIC_FIELDS}
+
+
+class JobIndexStats:
+    def __init__(self):
+        self._lock = Lock()
+        self.builds = 0
+        self.last_build_ms = 0.0
+        self.queries = 0
+        self.query_seconds = 0.0
+
+    def record_build(self, elapsed: float):
+        with self._lock:
+            self.builds += 1
+            self.last_build_ms = round(elapsed * 1000, 2)
+
+    def record_query(self, elapsed: float):
+        with self._lock:
+            self.queries += 1
+            self.query_seconds += elapsed
+
+    def stats(self) -> dict:
+        return {
+            "builds": self.builds,
+            "last_build_ms": self.last_build_ms,
+            "queries": self.queries,
+            "avg_query_ms": round(self.query_seconds * 1000 / self.queries, 3) if self.queries else 0.0,
+        }
+
+
+index_stats = JobIndexStats()
+metrics.register("job_index", index_stats.stats)
+
+
+def search(segments: Iterable[JobSegment], query: str = "", location: str = "", limit: int = 10) -> List[Dict]:
+    """
+    Jobs matching any query term, best BM25 score first (boosted for preferred
+    locations, which also break ties). An empty query matches everything in
+    feed order; `location` keeps jobs at that location, then remote ones.
+    """
+    started = time.perf_counter()
+    segments = [segment for segment in segments if len(segment)]
+    terms = set(tokenize(query))
+
+    documents = sum(len(segment) for segment in segments)
+    average_length = sum(segment.total_length for segment in segments) / documents if documents else 0.0
+
+    ranked = []  # (elsewhere, -score, not preferred, segment position, doc id)
+    for position, segment in enumerate(segments):
+        local = segment.at_location(location)
+        allowed = None if local is None else local | segment.remote
+
+        def rank(doc_id, score):
+            elsewhere = local is not None and doc_id not in local
+            preferred = doc_id in segment.preferred
+            if preferred:
+                score *= PREFERRED_BOOST
+            return (elsewhere, -score, not preferred, position, doc_id)
+
+        if not terms:
+            doc_ids = range(len(segment)) if allowed is None else sorted(allowed)
+            ranked.extend(rank(doc_id, 0.0) for doc_id in doc_ids)
+            continue
+
+        scores = defaultdict(float)
+        for term in terms:
+            postings = segment.postings.get(term)
+            if not postings:
+                continue
+            df = sum(other.document_frequency(term) for other in segments)
+            idf = math.log(1 + (documents - df + 0.5) / (df + 0.5))
+            for doc_id, tf in postings:
+                if allowed is not None and doc_id not in allowed:
+                    continue
+                norm = K1 * (1 - B + B * segment.lengths[doc_id] / average_length) if average_length else K1
+                scores[doc_id] += idf * tf * (K1 + 1) / (tf + norm)
+        ranked.extend(rank(doc_id, score) for doc_id, score in scores.items())
+
+    results = [segments[key[3]].public(key[4]) for key in heapq.nsmallest(limit, ranked)]
+    index_stats.record_query(time.perf_counter() - started)
+    return results
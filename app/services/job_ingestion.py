@@ -0,0 +1,152 @@
+"""
+Background ingestion of job board listings.
+
+A single asyncio task sweeps every source each JOB_INGEST_INTERVAL_SECONDS:
+it pages through the source's feed (up to JOB_INGEST_MAX_PAGES), upserts each
+page into the `jobs` table (see job_store.py), deletes listings that have not
+been seen for JOB_LISTING_MAX_AGE_HOURS, and swaps a freshly built index of
+the stored listings into `job_feeds`, so searches pick it up immediately.
+
+A source swept recently (by this or another app process, judging by the
+table) is skipped until it is due again, so restarts and extra workers don't
+hammer the job boards. A failed sweep keeps the listings already stored and
+is retried with exponential backoff (1, 2, 4, ... minutes, up to the
+interval).
+"""
+import asyncio
+import time
+from datetime import datetime, timedelta
+from threading import Lock
+from app.core.config import get_settings
+from app.core import metrics
+from app.services import job_store
+from app.services.job_feeds import job_feeds
+from app.services.job_index import JobSegment
+from app.services.job_service import job_service, SOURCES
+
+settings = get_settings()
+
+# How often the loop looks for due sources; also the first retry delay after a failure
+_CHECK_SECONDS = 60
+
+
+class JobIngestionService:
+    def __init__(
+        self,
+        interval_seconds: int = settings.JOB_INGEST_INTERVAL_SECONDS,
+        max_pages: int = settings.JOB_INGEST_MAX_PAGES,
+        max_age_hours: int = settings.JOB_LISTING_MAX_AGE_HOURS
+    ):
+        self.interval = timedelta(seconds=interval_seconds)
+        self.max_pages = max_pages
+        self.max_age = timedelta(hours=max_age_hours)
+        self._task = None
+        self._lock = Lock()
+        self.sweeps = {}  # source -> outcome of its latest sweep
+        self._next_attempt = {}  # source -> monotonic time of its next sweep
+        self._failures = {}  # source -> consecutive failed sweeps
+
+    def start(self):
+        """Start the ingestion loop (call from a running event loop)"""
+        if self._task is not None or not settings.JOB_INGEST_ENABLED:
+            return
+        self._task = asyncio.create_task(self._run())
+        print(f"✓ Job ingestion: every {int(self.interval.total_seconds())}s, up to {self.max_pages} page(s) per source")
+
+    async def shutdown(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        while True:
+            for source in SOURCES:
+                if time.monotonic() < self._next_attempt.get(source, 0):
+                    continue
+                try:
+                    last_seen = await asyncio.to_thread(job_store.last_seen, source)
+                    age = datetime.utcnow() - last_seen if last_seen is not None else None
+                    if age is not None and age < self.interval:
+                        # Swept recently (possibly by another process)
+                        self._next_attempt[source] = time.monotonic() + (self.interval - age).total_seconds()
+                        continue
+                    sweep = await self.ingest(source)
+                    failed = "error" in sweep
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self._record(source, error=str(e))
+                    print(f"❌ {source} ingestion failed: {e}")
+                    failed = True
+                self._schedule(source, failed)
+            await asyncio.sleep(_CHECK_SECONDS)
+
+    def _schedule(self, source: str, failed: bool):
+        """Next sweep after the interval; after failures, back off exponentially up to it"""
+        if failed:
+            self._failures[source] = self._failures.get(source, 0) + 1
+            delay = min(self.interval.total_seconds(), _CHECK_SECONDS * 2 ** (self._failures[source] - 1))
+        else:
+            self._failures.pop(source, None)
+            delay = self.interval.total_seconds()
+        self._next_attempt[source] = time.monotonic() + delay
+
+    def _record(self, source: str, **outcome):
+        with self._lock:
+            self.sweeps[source] = {"finished_at": datetime.utcnow().isoformat(timespec="seconds"), **outcome}
+
+    async def ingest(self, source: str) -> dict:
+        """Sweep one source into the jobs table and refresh its search index"""
+        started = time.perf_counter()
+        seen_at = datetime.utcnow()
+        pages = upserted = 0
+        url = None
+
+        while pages < self.max_pages:
+            page = await job_service.fetch_page(source, url)
+            if page is None:
+                break
+            jobs, url = page
+            pages += 1
+            upserted += await asyncio.to_thread(job_store.upsert_listings, source, jobs, seen_at)
+            if not url:
+                break
+
+        if not pages:
+            self._record(source, error="fetch failed", pages=0)
+            return self.sweeps[source]
+
+        # Listings are only expired after a sweep that actually reached the source
+        expired = await asyncio.to_thread(job_store.expire_listings, source, self.max_age)
+        listings = await asyncio.to_thread(job_store.stored_listings, source)
+        job_feeds.put(source, await asyncio.to_thread(JobSegment, listings))
+
+        self._record(
+            source,
+            pages=pages,
+            upserted=upserted,
+            expired=expired,
+            stored=len(listings),
+            seconds=round(time.perf_counter() - started, 2)
+        )
+        print(f"✓ {source}: {upserted} listing(s) from {pages} page(s), {expired} expired, {len(listings)} stored")
+        return self.sweeps[source]
+
+    def stats(self) -> dict:
+        with self._lock:
+            sweeps = {source: dict(sweep) for source, sweep in self.sweeps.items()}
+        return {
+            "enabled": settings.JOB_INGEST_ENABLED,
+            "running": self._task is not None and not self._task.done(),
+            "stored": job_store.listing_counts(),
+            "sweeps": sweeps,
+            "consecutive_failures": dict(self._failures),
+            "next_sweep_in_seconds": {
+                source: max(0, round(at - time.monotonic())) for source, at in self._next_attempt.items()
+            },
+        }
+
+
+job_ingestion = JobIngestionService()
+metrics.register("job_ingestion", job_ingestion.stats)
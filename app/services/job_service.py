@@ -1,35 +1,199 @@
+"""
+Job search across public job boards (Arbeitnow + Remotive).
+
+Sources are fetched concurrently over one pooled `httpx.AsyncClient`, so a
+search takes as long as the slowest source rather than the sum of them and
+never blocks the event loop. Each source has its own deadline
+(ARBEITNOW_TIMEOUT_SECONDS / REMOTIVE_TIMEOUT_SECONDS); a source that misses
+it contributes no jobs and the others are returned as partial results.
+
+Listings are collected in the background into the local `jobs` table (see
+job_ingestion.py and job_store.py). Searches run against an index of that
+table (job_index.py) kept in memory by `job_feeds` (job_feeds.py), so they
+never wait on the job boards; only before the first sweep has stored a
+source's listings is its live first page used instead.
+"""
+import asyncio
+import time
+import httpx
+from datetime import datetime
+from functools import partial
+from threading import Lock
+from typing import List, Dict, Optional, Tuple
+from app.core.config import get_settings
+from app.core import metrics
+from app.services.job_feeds import job_feeds
+from app.services import job_index, job_store
+from app.services.job_index import JobSegment
+
+settings = get_settings()
+
+SOURCES = ("arbeitnow", "remotive")
+
+# Arbeitnow is mostly German listings; those are left out of the index
+EXCLUDED_LOCATIONS = ['germany', 'deutschland', 'berlin', 'munich', 'hamburg']
+
+
+class JobSourceStats:
+    """Fetch outcomes and latency per job source"""
+
+    def __init__(self):
+        self._lock = Lock()
+        self.sources = {}
+
+    def record(self, source: str, outcome: str, elapsed: float):
+        with self._lock:
+            entry = self.sources.setdefault(
+                source, {"ok": 0, "timeouts": 0, "errors": 0, "last_ms": 0.0}
+            )
+            entry[outcome] += 1
+            entry["last_ms"] = round(elapsed * 1000, 1)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {source: dict(entry) for source, entry in self.sources.items()}
+
+
+job_source_stats = JobSourceStats()
+metrics.register("job_sources", job_source_stats.stats)
 
-import requests
-from typing import List, Dict, Optional
 
 class JobSearchService:
     def __init__(self):
-        self.arbeitnow_url = "https://www.arbeitnow.com/api/job-board-api"
-        self.remotive_url = "https://remotive.com/api/remote-jobs"
-    
-    def search_jobs(self, query: str, location: str = "", limit: int = 10) -> List[Dict]:
+        self.feed_urls = {
+            "arbeitnow": "https://www.arbeitnow.com/api/job-board-api",
+            "remotive": "https://remotive.com/api/remote-jobs",
+        }
+        self.timeouts = {
+            "arbeitnow": settings.ARBEITNOW_TIMEOUT_SECONDS,
+            "remotive": settings.REMOTIVE_TIMEOUT_SECONDS,
+        }
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared client; keeps connections to the job boards alive between searches"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=settings.JOB_SOURCE_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.JOB_SOURCE_MAX_CONNECTIONS
+                ),
+                follow_redirects=True
+            )
+        return self._client
+
+    async def close(self):
+        await job_feeds.close()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _get_json(self, source: str, url: str) -> Optional[dict]:
+        """GET `url` within the source's deadline; None if it fails or is too slow"""
+        timeout = self.timeouts[source]
+        started = time.perf_counter()
+        try:
+            response = await asyncio.wait_for(self.client.get(url, timeout=timeout), timeout)
+            print(f"📡 {source} response status: {response.status_code}")
+            if response.status_code != 200:
+                job_source_stats.record(source, "errors", time.perf_counter() - started)
+                return None
+            data = response.json()
+        except (asyncio.TimeoutError, httpx.TimeoutException):
+            job_source_stats.record(source, "timeouts", time.perf_counter() - started)
+            print(f"⏱️ {source} timed out after {timeout}s, returning partial results")
+            return None
+        except Exception as e:
+            job_source_stats.record(source, "errors", time.perf_counter() - started)
+            print(f"❌ {source} API error: {e}")
+            return None
+
+        job_source_stats.record(source, "ok", time.perf_counter() - started)
+        return data
+
+    async def fetch_page(self, source: str, url: Optional[str] = None) -> Optional[Tuple[List[Dict], Optional[str]]]:
+        """One page of `source` as searchable listings plus the next page's URL; None if the fetch failed"""
+        data = await self._get_json(source, url or self.feed_urls[source])
+        if data is None:
+            return None
+        if source == "arbeitnow":
+            jobs = [job for job in map(self._arbeitnow_job, data.get("data", [])) if job is not None]
+            return jobs, (data.get("links") or {}).get("next")
+        # Remotive returns every listing in one response
+        return [self._remotive_job(job) for job in data.get("jobs", [])], None
+
+    @staticmethod
+    def _posted_at(value) -> Optional[datetime]:
+        try:
+            if isinstance(value, (int, float)):
+                return datetime.utcfromtimestamp(value)
+            if value:
+                return datetime.fromisoformat(value)
+        except (ValueError, OverflowError, OSError):
+            pass
+        return None
+
+    def _arbeitnow_job(self, job: Dict) -> Optional[Dict]:
+        """Searchable listing for an Arbeitnow job; None for excluded (German) locations"""
+        job_location = (job.get("location") or "").lower()
+        if any(excluded in job_location for excluded in EXCLUDED_LOCATIONS):
+            return None
+        return {
+            "title": job.get("title"),
+            "company": job.get("company_name"),
+            "location": job.get("location"),
+            "url": job.get("url"),
+            "remote": job.get("remote", False),
+            "description": job_store.summary(job.get("description")),
+            "source": "arbeitnow",
+            "tags": job.get("tags") or [],
+            "body": job.get("description"),
+            "posted_at": self._posted_at(job.get("created_at")),
+        }
+
+    def _remotive_job(self, job: Dict) -> Dict:
+        return {
+            "title": job.get("title"),
+            "company": job.get("company_name"),
+            "location": "Remote",
+            "url": job.get("url"),
+            "remote": True,
+            "description": job_store.summary(job.get("description")),
+            "source": "remotive",
+            "tags": [job.get("category") or "", *(job.get("tags") or [])],
+            "body": job.get("description"),
+            "posted_at": self._posted_at(job.get("publication_date")),
+        }
+
+    async def _load(self, source: str) -> Optional[JobSegment]:
+        """Index over the stored listings of `source` (the live first page until a sweep has stored some)"""
+        jobs = await asyncio.to_thread(job_store.stored_listings, source)
+        if not jobs:
+            page = await self.fetch_page(source)
+            if page is None:
+                return None
+            jobs = page[0]
+        # Tokenizing a whole feed is CPU work; keep it off the event loop
+        return await asyncio.to_thread(JobSegment, jobs)
+
+    async def search_jobs(self, query: str, location: str = "", limit: int = 10) -> List[Dict]:
         """
-        Searches for jobs using multiple APIs (Arbeitnow + Remotive).
+        Searches the stored Arbeitnow + Remotive listings, ranked with BM25.
         Returns real jobs only - no mock data.
         """
-        jobs = []
-        
-        # Try Arbeitnow API
-        arbeitnow_jobs = self._fetch_arbeitnow_jobs(query, location)
-        jobs.extend(arbeitnow_jobs)
-        print(f"💼 Total jobs from Arbeitnow: {len(arbeitnow_jobs)}")
-        
-        # Try Remotive API (for remote jobs)
-        remotive_jobs = self._fetch_remotive_jobs(query)
-        jobs.extend(remotive_jobs)
-        print(f"💼 Total jobs from Remotive: {len(remotive_jobs)}")
-        
-        # If no jobs found with query, return recent jobs instead of mock data
-        if not jobs and not query:
-            print("⚠️ No query provided, fetching recent jobs")
-            arbeitnow_jobs = self._fetch_arbeitnow_jobs("", "")
-            jobs.extend(arbeitnow_jobs[:10])
-        
+        print(f"🔍 Searching jobs for query: '{query}'")
+        segments = await asyncio.gather(*(
+            job_feeds.get(source, partial(self._load, source)) for source in SOURCES
+        ))
+        jobs = job_index.search(segments, query, location, limit * 2)
+        print(f"💼 {len(jobs)} matching jobs out of {sum(len(segment) for segment in segments)}")
+
+        # If nothing matches, return recent jobs instead of mock data
+        if not jobs and query:
+            print("⚠️ No matching jobs, returning recent jobs")
+            jobs = job_index.search(segments, "", "", limit * 2)
+
         # Remove duplicates based on URL
         seen_urls = set()
         unique_jobs = []
@@ -41,137 +205,6 @@ class JobSearchService:
         
         print(f"✅ Returning {len(unique_jobs[:limit])} unique jobs")
         return unique_jobs[:limit]
-    
-    def _fetch_arbeitnow_jobs(self, query: str, location: str = "") -> List[Dict]:
-        """Fetch jobs from Arbeitnow API."""
-        jobs = []
-        try:
-            print(f"🔍 Fetching from Arbeitnow API for query: '{query}'")
-            response = requests.get(self.arbeitnow_url, timeout=5)
-            print(f"📡 Arbeitnow response status: {response.status_code}")
-            if response.status_code == 200:
-                data = response.json()
-                api_jobs = data.get("data", [])
-                print(f"📊 Arbeitnow returned {len(api_jobs)} total jobs")
-                
-                # Preferred locations (US, India, Remote)
-                preferred_locations = ['united states', 'usa', 'us', 'india', 'remote', 'worldwide', 'anywhere']
-                excluded_locations = ['germany', 'deutschland', 'berlin', 'munich', 'hamburg']
-                
-                # First pass: Filter by query and prioritize US/India jobs
-                priority_jobs = []
-                other_jobs = []
-                
-                # Client-side filtering
-                for job in api_jobs:
-                    title = job.get("title", "").lower()
-                    description = job.get("description", "").lower()
-                    job_location = job.get("location", "").lower()
-                    tags = [tag.lower() for tag in job.get("tags", [])]
-                    q_lower = query.lower() if query else ""
-                    loc_lower = location.lower() if location else ""
-                    
-                    # Skip German jobs
-                    if any(excluded in job_location for excluded in excluded_locations):
-                        continue
-                    
-                    # More flexible matching - check title, description, and tags
-                    query_match = False
-                    if not q_lower:
-                        query_match = True
-                    else:
-                        # Split query into words for better matching
-                        query_words = q_lower.split()
-                        # Match if ANY query word is in title, description, or tags
-                        for word in query_words:
-                            if (word in title or 
-                                word in description or 
-                                any(word in tag for tag in tags)):
-                                query_match = True
-                                break
-                    
-                    # Match location if specified
-                    location_match = not loc_lower or loc_lower in job_location or "remote" in job_location
-                    
-                    if query_match and location_match:
-                        job_data = {
-                            "title": job.get("title"),
-                            "company": job.get("company_name"),
-                            "location": job.get("location"),
-                            "url": job.get("url"),
-                            "remote": job.get("remote", False),
-                            "description": (job.get("description", "")[:200] + "...") if job.get("description") else "No description available.",
-                            "source": "arbeitnow"
-                        }
-                        
-                        # Prioritize US/India jobs
-                        if any(pref in job_location for pref in preferred_locations):
-                            priority_jobs.append(job_data)
-                        else:
-                            other_jobs.append(job_data)
-                
-                # Combine priority jobs first, then others
-                jobs = priority_jobs + other_jobs
-                print(f"✅ Found {len(priority_jobs)} US/India/Remote jobs, {len(other_jobs)} other jobs")
-                        
-                # If no matches but we have jobs from API, be more lenient
-                if not jobs and api_jobs:
-                    print("⚠️ Strict filtering returned 0 results, being more lenient")
-                    # Just return recent jobs from the API, excluding German ones
-                    for job in api_jobs[:20]:
-                        job_location = job.get("location", "").lower()
-                        if not any(excluded in job_location for excluded in excluded_locations):
-                            jobs.append({
-                                "title": job.get("title"),
-                                "company": job.get("company_name"),
-                                "location": job.get("location"),
-                                "url": job.get("url"),
-                                "remote": job.get("remote", False),
-                                "description": (job.get("description", "")[:200] + "...") if job.get("description") else "No description available.",
-                                "source": "arbeitnow"
-                            })
-                            if len(jobs) >= 10:
-                                break
-                
-                print(f"✅ Arbeitnow filtered to {len(jobs)} matching jobs")
-        except Exception as e:
-            print(f"❌ Arbeitnow API error: {e}")
-        
-        return jobs
-    
-    def _fetch_remotive_jobs(self, query: str) -> List[Dict]:
-        """Fetch remote jobs from Remotive API."""
-        jobs = []
-        try:
-            response = requests.get(self.remotive_url, timeout=5)
-            if response.status_code == 200:
-                data = response.json()
-                api_jobs = data.get("jobs", [])
-                
-                q_lower = query.lower() if query else ""
-                
-                for job in api_jobs:
-                    title = job.get("title", "").lower()
-                    category = job.get("category", "").lower()
-                    
-                    # Match query in title or category
-                    if not q_lower or q_lower in title or q_lower in category:
-                        jobs.append({
-                            "title": job.get("title"),
-                            "company": job.get("company_name"),
-                            "location": "Remote",
-                            "url": job.get("url"),
-                            "remote": True,
-                            "description": (job.get("description", "")[:200] + "...") if job.get("description") else "No description available.",
-                            "source": "remotive"
-                        })
-                        
-                        if len(jobs) >= 5:  # Limit Remotive results
-                            break
-        except Exception as e:
-            print(f"Error fetching from Remotive: {e}")
-        
-        return jobs
 
     def _get_mock_jobs(self, query: str) -> List[Dict]:
         """
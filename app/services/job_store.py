@@ -0,0 +1,115 @@
+"""
+Local store of job board listings (the `jobs` table).
+
+Listings are upserted by URL on every ingestion sweep: new ones get
+`first_seen_at`, all of them get `last_seen_at` bumped, and listings no sweep
+has seen for JOB_LISTING_MAX_AGE_HOURS are deleted. Searches read from here
+(through the index in job_index.py) instead of the job boards.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert
+from app.db.database import SessionLocal
+from app.models.models import JobListing
+
+# Bound parameters per upsert statement stay well under SQLite's limit
+_BATCH_SIZE = 200
+
+
+def summary(description: str | None) -> str:
+    return (description[:200] + "...") if description else "No description available."
+
+
+def upsert_listings(source: str, jobs: List[Dict], seen_at: datetime) -> int:
+    """Insert new listings and refresh known ones (matched by URL); returns rows written"""
+    rows = [
+        {
+            "url": job["url"],
+            "source": source,
+            "title": job.get("title"),
+            "company": job.get("company"),
+            "location": job.get("location"),
+            "remote": bool(job.get("remote")),
+            "description": job.get("body"),
+            "tags": job.get("tags") or [],
+            "posted_at": job.get("posted_at"),
+            "first_seen_at": seen_at,
+            "last_seen_at": seen_at,
+        }
+        for job in jobs if job.get("url")
+    ]
+    if not rows:
+        return 0
+
+    db = SessionLocal()
+    try:
+        for start in range(0, len(rows), _BATCH_SIZE):
+            statement = insert(JobListing).values(rows[start:start + _BATCH_SIZE])
+            # Everything but first_seen_at follows the latest sweep
+            updated = {
+                column: statement.excluded[column]
+                for column in ("source", "title", "company", "location", "remote",
+                               "description", "tags", "posted_at", "last_seen_at")
+            }
+            db.execute(statement.on_conflict_do_update(index_elements=["url"], set_=updated))
+        db.commit()
+    finally:
+        db.close()
+    return len(rows)
+
+
+def expire_listings(source: str, max_age: timedelta) -> int:
+    """Delete listings of `source` that no sweep has seen within `max_age`"""
+    db = SessionLocal()
+    try:
+        deleted = db.query(JobListing).filter(
+            JobListing.source == source,
+            JobListing.last_seen_at < datetime.utcnow() - max_age
+        ).delete(synchronize_session=False)
+        db.commit()
+        return deleted
+    finally:
+        db.close()
+
+
+def last_seen(source: str) -> Optional[datetime]:
+    """When the latest sweep of `source` finished writing, if any"""
+    db = SessionLocal()
+    try:
+        return db.query(func.max(JobListing.last_seen_at)).filter(JobListing.source == source).scalar()
+    finally:
+        db.close()
+
+
+def stored_listings(source: str) -> List[Dict]:
+    """Listings of `source`, newest postings first, in the shape job_index.JobSegment expects"""
+    db = SessionLocal()
+    try:
+        listings = db.query(JobListing).filter(JobListing.source == source).order_by(
+            JobListing.posted_at.is_(None), JobListing.posted_at.desc(), JobListing.id
+        ).all()
+        return [
+            {
+                "title": listing.title,
+                "company": listing.company,
+                "location": listing.location,
+                "url": listing.url,
+                "remote": listing.remote,
+                "description": summary(listing.description),
+                "source": listing.source,
+                "tags": listing.tags or [],
+                "body": listing.description,
+            }
+            for listing in listings
+        ]
+    finally:
+        db.close()
+
+
+def listing_counts() -> Dict[str, int]:
+    db = SessionLocal()
+    try:
+        return dict(db.query(JobListing.source, func.count(JobListing.id)).group_by(JobListing.source).all())
+    finally:
+        db.close()
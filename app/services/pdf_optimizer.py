@@ -0,0 +1,100 @@
+"""
+Output optimization for generated PDFs (pypdf).
+
+ReportLab and xhtml2pdf write every content stream ASCII85 + Flate encoded,
+which inflates each page stream by roughly a quarter, and repeat identical
+resource objects across pages. `optimize_pdf` re-encodes content streams with
+plain Flate at maximum compression and merges duplicate / drops unreferenced
+objects. The optimized file is only used when it is actually smaller, and a
+failure just returns the original.
+
+Our templates use the standard (base-14) PDF fonts, which are never embedded,
+so there is no font program to subset; ReportLab already subsets TrueType
+fonts when a template registers one.
+
+Optimization runs next to the render in the render pool; `render_optimized`
+awaits both and records the bytes saved per render for `/api/metrics`.
+"""
+import io
+from threading import Lock
+from pypdf import PdfReader, PdfWriter
+from app.core.config import get_settings
+from app.core import metrics
+from app.services.render_pool import render_pool
+
+settings = get_settings()
+
+
+def optimize_pdf(pdf_bytes: bytes) -> bytes:
+    """Recompress content streams and deduplicate objects; never returns a larger file"""
+    try:
+        writer = PdfWriter(clone_from=PdfReader(io.BytesIO(pdf_bytes)))
+        for page in writer.pages:
+            page.compress_content_streams(level=9)
+        writer.compress_identical_objects()
+
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        optimized = buffer.getvalue()
+    except Exception as e:
+        print(f"PDF optimization skipped: {e}")
+        return pdf_bytes
+
+    return optimized if len(optimized) < len(pdf_bytes) else pdf_bytes
+
+
+def _render_and_optimize(fn, *args) -> tuple[bytes, int]:
+    """Render pool task: (optimized PDF bytes, size before optimization)"""
+    pdf_bytes = fn(*args)
+    if not settings.PDF_OPTIMIZE:
+        return pdf_bytes, len(pdf_bytes)
+    return optimize_pdf(pdf_bytes), len(pdf_bytes)
+
+
+class PdfOptimizerStats:
+    """Bytes saved by optimization, per render and in total"""
+
+    def __init__(self):
+        self._lock = Lock()
+        self.renders = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.last_saved = 0
+
+    def record(self, original_size: int, optimized_size: int):
+        with self._lock:
+            self.renders += 1
+            self.bytes_in += original_size
+            self.bytes_out += optimized_size
+            self.last_saved = original_size - optimized_size
+
+    def stats(self) -> dict:
+        saved = self.bytes_in - self.bytes_out
+        return {
+            "enabled": settings.PDF_OPTIMIZE,
+            "renders": self.renders,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "bytes_saved": saved,
+            "last_saved": self.last_saved,
+            "avg_saved_per_render": round(saved / self.renders) if self.renders else 0,
+            "saved_ratio": round(saved / self.bytes_in, 4) if self.bytes_in else 0.0,
+        }
+
+
+pdf_optimizer = PdfOptimizerStats()
+metrics.register("pdf_optimizer", pdf_optimizer.stats)
+
+
+async def render_optimized(fn, *args) -> bytes:
+    """Run the PDF render `fn(*args)` in the render pool and return the optimized output"""
+    pdf_bytes, original_size = await render_pool.run(_render_and_optimize, fn, *args)
+    pdf_optimizer.record(original_size, len(pdf_bytes))
+    return pdf_bytes
+
+
+def optimize_and_record(pdf_bytes: bytes) -> bytes:
+    """In-process variant of `render_optimized` for synchronous callers"""
+    optimized = optimize_pdf(pdf_bytes) if settings.PDF_OPTIMIZE else pdf_bytes
+    pdf_optimizer.record(len(pdf_bytes), len(optimized))
+    return optimized
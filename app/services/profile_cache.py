@@ -0,0 +1,131 @@
+"""
+Read-through cache of serialized profile payloads, keyed by user id.
+
+Entries live in a bounded in-process LRU with a TTL. When
+PROFILE_CACHE_REDIS_URL is set (and the `redis` package is installed) a
+shared Redis backend is used instead, so every worker sees the same entries
+and invalidations.
+
+Each entry is a (document_version, payload) pair. Entries are invalidated
+after any commit that rebuilds a user's profile document (profile CRUD
+endpoints, chat extraction, resume upload, ...), and callers that already
+know the current version can reject stale entries from other workers.
+"""
+import json
+from sqlalchemy.orm import Session
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+from app.core import metrics
+from app.services.profile_document import get_versioned_profile_document, on_documents_rebuilt
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+settings = get_settings()
+
+
+class ProfileCache:
+    def __init__(self):
+        self.ttl_seconds = settings.PROFILE_CACHE_TTL_SECONDS
+        self.local = TTLCache(
+            max_entries=settings.PROFILE_CACHE_MAX_ENTRIES,
+            ttl_seconds=self.ttl_seconds
+        )
+        self.shared = None
+
+        if settings.PROFILE_CACHE_REDIS_URL:
+            if redis is None:
+                print("WARNING: PROFILE_CACHE_REDIS_URL is set but `redis` is not installed. Using in-process cache.")
+            else:
+                self.shared = redis.Redis.from_url(settings.PROFILE_CACHE_REDIS_URL)
+
+        self.shared_hits = 0
+        self.shared_misses = 0
+        self.shared_errors = 0
+
+    def _key(self, user_id: int) -> str:
+        return f"profile:{user_id}"
+
+    def get(self, user_id: int) -> tuple[int, bytes] | None:
+        if self.shared is None:
+            return self.local.get(user_id)
+
+        try:
+            value = self.shared.get(self._key(user_id))
+        except Exception as e:
+            print(f"Profile cache backend error: {e}")
+            self.shared_errors += 1
+            return None
+
+        if value is None:
+            self.shared_misses += 1
+            return None
+        self.shared_hits += 1
+        version, payload = value.split(b":", 1)
+        return int(version), payload
+
+    def set(self, user_id: int, version: int, payload: bytes):
+        if self.shared is None:
+            self.local.set(user_id, (version, payload))
+            return
+
+        try:
+            self.shared.set(self._key(user_id), b"%d:%s" % (version, payload), ex=self.ttl_seconds)
+        except Exception as e:
+            print(f"Profile cache backend error: {e}")
+            self.shared_errors += 1
+
+    def invalidate(self, user_ids):
+        for user_id in user_ids:
+            self.local.delete(user_id)
+        if self.shared is not None:
+            try:
+                self.shared.delete(*[self._key(user_id) for user_id in user_ids])
+            except Exception as e:
+                print(f"Profile cache backend error: {e}")
+                self.shared_errors += 1
+
+    def stats(self) -> dict:
+        if self.shared is None:
+            return {"backend": "memory", **self.local.stats()}
+
+        lookups = self.shared_hits + self.shared_misses
+        return {
+            "backend": "redis",
+            "hits": self.shared_hits,
+            "misses": self.shared_misses,
+            "hit_rate": round(self.shared_hits / lookups, 4) if lookups else 0.0,
+            "errors": self.shared_errors,
+        }
+
+
+profile_cache = ProfileCache()
+on_documents_rebuilt(profile_cache.invalidate)
+metrics.register("profile_cache", profile_cache.stats)
+
+
+def get_versioned_profile_payload(db: Session, user_id: int, version: int | None = None) -> tuple[int, bytes]:
+    """
+    (document_version, serialized profile document) for a user (read-through).
+    If `version` is given, a cached entry for any other version is ignored.
+    """
+    entry = profile_cache.get(user_id)
+    if entry is not None and (version is None or entry[0] == version):
+        return entry
+
+    version, document = get_versioned_profile_document(db, user_id)
+    payload = json.dumps(document).encode("utf-8")
+    profile_cache.set(user_id, version, payload)
+    return version, payload
+
+
+def get_profile_payload(db: Session, user_id: int) -> bytes:
+    """Serialized profile document for a user (read-through)"""
+    return get_versioned_profile_payload(db, user_id)[1]
+
+
+def get_cached_profile_document(db: Session, user_id: int) -> dict:
+    """Profile document for a user, served from the cache when possible"""
+    return json.loads(get_profile_payload(db, user_id))
@@ -0,0 +1,212 @@
+"""
+Materialized profile document.
+
+The full profile (personal info + experiences, education, skills, projects)
+is denormalized into `UserProfile.document`, with a monotonically increasing
+`UserProfile.document_version`. Read-heavy paths (profile API, chat context,
+cover letters, analysis) load it with a single lookup instead of reading five
+tables and decoding the languages/hobbies columns on every request.
+
+The document is rebuilt inside the committing transaction whenever a profile
+row changes: session events track the affected user ids on flush and rebuild
+their documents just before commit.
+"""
+from itertools import chain
+import json
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.models.models import UserProfile, Experience, Education, Skill, Project
+
+PROFILE_MODELS = (UserProfile, Experience, Education, Skill, Project)
+
+_DIRTY_KEY = "profile_document_dirty"
+_REBUILT_KEY = "profile_document_rebuilt"
+_REBUILDING_KEY = "profile_document_rebuilding"
+
+# Callbacks invoked with the set of user ids whose documents were committed
+_rebuilt_listeners = []
+# Session factory the events are registered on (see register_session_events)
+_session_factory = None
+
+
+def _json_list(value) -> list:
+    return json.loads(value) if value else []
+
+
+def build_profile_document(db: Session, user_id: int, profile: UserProfile) -> dict:
+    """Build the profile document (same shape as GET /api/profile/) from the tables"""
+    experiences = db.query(Experience).filter(Experience.user_id == user_id).order_by(Experience.order, Experience.id).all()
+    education = db.query(Education).filter(Education.user_id == user_id).order_by(Education.order, Education.id).all()
+    skills = db.query(Skill).filter(Skill.user_id == user_id).order_by(Skill.order, Skill.id).all()
+    projects = db.query(Project).filter(Project.user_id == user_id).order_by(Project.order, Project.id).all()
+
+    return {
+        "profile": {
+            "full_name": profile.full_name,
+            "email": profile.email,
+            "phone": profile.phone,
+            "location": profile.location,
+            "linkedin": profile.linkedin,
+            "github": profile.github,
+            "portfolio": profile.portfolio,
+            "summary": profile.summary,
+            "languages": _json_list(profile.languages),
+            "hobbies": _json_list(profile.hobbies),
+            "selected_template": profile.selected_template,
+        },
+        "experiences": [
+            {
+                "id": exp.id,
+                "title": exp.title,
+                "company": exp.company,
+                "location": exp.location,
+                "start_date": exp.start_date,
+                "end_date": exp.end_date,
+                "is_current": exp.is_current,
+                "description": exp.description,
+                "achievements": exp.achievements or []
+            }
+            for exp in experiences
+        ],
+        "education": [
+            {
+                "id": edu.id,
+                "degree": edu.degree,
+                "institution": edu.institution,
+                "location": edu.location,
+                "graduation_date": edu.graduation_date,
+                "gpa": edu.gpa
+            }
+            for edu in education
+        ],
+        "skills": [
+            {
+                "id": skill.id,
+                "category": skill.category,
+                "skills": skill.skills or []
+            }
+            for skill in skills
+        ],
+        "projects": [
+            {
+                "id": proj.id,
+                "name": proj.name,
+                "description": proj.description,
+                "date": proj.date,
+                "url": proj.url,
+                "technologies": proj.technologies or []
+            }
+            for proj in projects
+        ]
+    }
+
+
+def refresh_profile_document(db: Session, user_id: int) -> UserProfile:
+    """Rebuild the stored document for a user and bump its version (does not commit)"""
+    profile = db.query(UserProfile).filter(UserProfile.user_id == user_id).first()
+    if not profile:
+        profile = UserProfile(user_id=user_id, document_version=0)
+        db.add(profile)
+        db.flush()
+
+    profile.document = build_profile_document(db, user_id, profile)
+    # SQL-side increment so concurrent writers never reuse a version
+    profile.document_version = UserProfile.document_version + 1
+    return profile
+
+
+def mark_profile_dirty(db: Session, user_id: int):
+    """Force a document rebuild on the next commit (for bulk statements the ORM can't track)"""
+    db.info.setdefault(_DIRTY_KEY, set()).add(user_id)
+
+
+def _load_profile(db: Session, user_id: int, profile: UserProfile | None) -> UserProfile:
+    if profile is None:
+        profile = db.query(UserProfile).filter(UserProfile.user_id == user_id).first()
+
+    if profile is None or profile.document is None:
+        # Rows written before the document existed: build it once and store it.
+        # Done in a session of its own so a read never commits the caller's
+        # pending changes.
+        if _session_factory is not None:
+            with _session_factory() as builder:
+                mark_profile_dirty(builder, user_id)
+                builder.commit()
+        else:
+            refresh_profile_document(db, user_id)
+            db.flush()
+        profile = db.query(UserProfile).filter(UserProfile.user_id == user_id).first()
+        db.refresh(profile)
+
+    return profile
+
+
+def get_profile_document(db: Session, user_id: int, profile: UserProfile | None = None) -> dict:
+    """Return the user's profile document, materializing it on first access"""
+    return _load_profile(db, user_id, profile).document
+
+
+def get_versioned_profile_document(db: Session, user_id: int) -> tuple[int, dict]:
+    """Return (document_version, document) read from the same row"""
+    profile = _load_profile(db, user_id, None)
+    return profile.document_version, profile.document
+
+
+def get_document_version(db: Session, user_id: int) -> int | None:
+    """Current document version without loading the document itself"""
+    return db.query(UserProfile.document_version).filter(UserProfile.user_id == user_id).scalar()
+
+
+# --- Session events ---
+
+def _track_profile_changes(session: Session, flush_context, instances):
+    if session.info.get(_REBUILDING_KEY):
+        return
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, PROFILE_MODELS) and obj.user_id is not None:
+            mark_profile_dirty(session, obj.user_id)
+
+
+def _rebuild_dirty_documents(session: Session):
+    session.flush()
+    user_ids = session.info.pop(_DIRTY_KEY, None)
+    if not user_ids:
+        return
+
+    session.info[_REBUILDING_KEY] = True
+    try:
+        for user_id in user_ids:
+            refresh_profile_document(session, user_id)
+        session.flush()
+    finally:
+        session.info.pop(_REBUILDING_KEY, None)
+    session.info.setdefault(_REBUILT_KEY, set()).update(user_ids)
+
+
+def _notify_rebuilt(session: Session):
+    user_ids = session.info.pop(_REBUILT_KEY, None)
+    if not user_ids:
+        return
+    for listener in _rebuilt_listeners:
+        listener(user_ids)
+
+
+def _discard_dirty(session: Session, previous_transaction=None):
+    session.info.pop(_DIRTY_KEY, None)
+    session.info.pop(_REBUILT_KEY, None)
+
+
+def on_documents_rebuilt(listener):
+    """Register a callback run after commit with the ids of users whose documents changed"""
+    _rebuilt_listeners.append(listener)
+    return listener
+
+
+def register_session_events(session_factory):
+    """Keep profile documents in sync for every session created by the factory"""
+    global _session_factory
+    _session_factory = session_factory
+    event.listen(session_factory, "before_flush", _track_profile_changes)
+    event.listen(session_factory, "before_commit", _rebuild_dirty_documents)
+    event.listen(session_factory, "after_commit", _notify_rebuilt)
+    event.listen(session_factory, "after_soft_rollback", _discard_dirty)
@@ -0,0 +1,184 @@
+"""
+Asynchronous resume render jobs.
+
+`POST /api/resume/jobs` records a `RenderJob` row and puts its id on an
+in-process priority queue. A fixed number of asyncio workers take jobs in
+priority order (FIFO within a priority) and render them through
+`resume_generator`, and therefore the render pool. Clients poll
+`GET /api/resume/jobs/{id}` and fetch the PDF from `.../artifact` once it is
+done, so no HTTP connection is held open for the render itself.
+
+Job state lives in the database, so any app worker can answer status polls.
+Jobs are claimed with a conditional UPDATE, so a job is rendered once even if
+several processes have it queued (e.g. after a restart).
+
+Submitting the same resume + template while a matching job is queued,
+running or recently finished returns that job instead of creating a new one.
+Finished jobs are pruned after RENDER_JOB_RETENTION_SECONDS.
+"""
+import asyncio
+import itertools
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from app.core.config import get_settings
+from app.core import metrics
+from app.db.database import SessionLocal
+from app.models.models import RenderJob
+from app.schemas.schemas import ResumeData
+from app.services.resume_generator import resume_generator
+
+settings = get_settings()
+
+PRIORITIES = {"high": 0, "normal": 1, "low": 2}
+
+# A job still marked running after this long was interrupted (e.g. by a restart)
+_STALE_AFTER = timedelta(minutes=5)
+
+
+class RenderJobService:
+    def __init__(
+        self,
+        workers: int = settings.RENDER_JOB_WORKERS,
+        retention_seconds: int = settings.RENDER_JOB_RETENTION_SECONDS
+    ):
+        self.workers = workers
+        self.retention = timedelta(seconds=retention_seconds)
+        self.queue = None
+        self._tasks = []
+        self._seq = itertools.count()  # FIFO order within a priority
+        self.completed = 0
+        self.failed = 0
+        self.deduplicated = 0
+
+    def start(self):
+        """Start the workers and requeue unfinished jobs (call from a running event loop)"""
+        if self._tasks:
+            return
+
+        self.queue = asyncio.PriorityQueue()
+        db = SessionLocal()
+        try:
+            stale_before = datetime.utcnow() - _STALE_AFTER
+            pending = db.query(RenderJob).filter(
+                (RenderJob.status == "queued") |
+                ((RenderJob.status == "running") & (RenderJob.started_at < stale_before))
+            ).order_by(RenderJob.created_at).all()
+            for job in pending:
+                job.status = "queued"
+                job.started_at = None
+                self._put(job)
+            db.commit()
+        finally:
+            db.close()
+
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        print(f"✓ Render jobs: {self.workers} worker(s), {len(pending)} job(s) requeued")
+
+    async def shutdown(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def _put(self, job: RenderJob):
+        self.queue.put_nowait((job.priority, next(self._seq), job.id))
+
+    def enqueue(
+        self,
+        db: Session,
+        data: ResumeData,
+        template_name: str,
+        user_id: int | None,
+        priority: str = "normal"
+    ) -> RenderJob:
+        """Create (or reuse an identical) render job and queue it"""
+        if not self._tasks:
+            self.start()
+        self._prune(db)
+
+        content_key = resume_generator.content_key(data, template_name)
+        existing = db.query(RenderJob).filter(
+            RenderJob.user_id == user_id,
+            RenderJob.content_key == content_key,
+            RenderJob.status != "failed"
+        ).order_by(RenderJob.created_at.desc()).first()
+        if existing:
+            self.deduplicated += 1
+            return existing
+
+        job = RenderJob(
+            id=uuid.uuid4().hex,
+            user_id=user_id,
+            content_key=content_key,
+            template_used=template_name,
+            payload=data.dict(),
+            priority=PRIORITIES.get(priority, PRIORITIES["normal"]),
+            status="queued"
+        )
+        db.add(job)
+        db.commit()
+        self._put(job)
+        return job
+
+    def _prune(self, db: Session):
+        cutoff = datetime.utcnow() - self.retention
+        deleted = db.query(RenderJob).filter(
+            RenderJob.status.in_(("done", "failed")),
+            RenderJob.finished_at < cutoff
+        ).delete(synchronize_session=False)
+        if deleted:
+            db.commit()
+
+    async def _worker(self):
+        while True:
+            _, _, job_id = await self.queue.get()
+            try:
+                await self._run(job_id)
+            except Exception as e:
+                print(f"Render job {job_id} error: {e}")
+            finally:
+                self.queue.task_done()
+
+    async def _run(self, job_id: str):
+        db = SessionLocal()
+        try:
+            # Claim the job; another worker or process may already have it
+            claimed = db.query(RenderJob).filter(
+                RenderJob.id == job_id,
+                RenderJob.status == "queued"
+            ).update({"status": "running", "started_at": datetime.utcnow()}, synchronize_session=False)
+            db.commit()
+            if not claimed:
+                return
+
+            job = db.get(RenderJob, job_id)
+            try:
+                _, pdf_bytes = await resume_generator.render_pdf(
+                    ResumeData(**job.payload), template_name=job.template_used
+                )
+                job.artifact = pdf_bytes
+                job.status = "done"
+                self.completed += 1
+            except Exception as e:
+                job.status = "failed"
+                job.error = str(e)
+                self.failed += 1
+
+            job.finished_at = datetime.utcnow()
+            db.commit()
+        finally:
+            db.close()
+
+    def stats(self) -> dict:
+        return {
+            "workers": len(self._tasks),
+            "queued": self.queue.qsize() if self.queue else 0,
+            "completed": self.completed,
+            "failed": self.failed,
+            "deduplicated": self.deduplicated,
+        }
+
+
+render_jobs = RenderJobService()
+metrics.register("render_jobs", render_jobs.stats)
@@ -0,0 +1,76 @@
+"""
+Process pool for CPU-bound document rendering (xhtml2pdf, ReportLab).
+
+Rendering takes hundreds of milliseconds of pure CPU, so running it inside an
+`async def` route blocks every other request on the worker. Routes instead
+`await render_pool.run(fn, *args)`, where `fn` is a picklable module-level
+function; the pool spreads renders across cores while the event loop keeps
+serving.
+
+Workers are spawned and warmed up when the app starts: each one imports the
+renderers and preloads the resume templates, so the first real render does
+not pay for imports or template compilation. RENDER_POOL_SIZE=0 keeps
+rendering in-process on a background thread (useful for debugging and for
+platforms without process support).
+"""
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+def _warm_worker():
+    """Initializer run once in every worker process"""
+    from app.services.resume_generator import preload_templates
+    from app.services import cover_letter_renderer  # noqa: F401 (imports ReportLab)
+    from app.services import resume_docx  # noqa: F401 (imports python-docx)
+    from app.services import pdf_optimizer  # noqa: F401 (imports pypdf)
+
+    preload_templates()
+
+
+def _ping(_=None):
+    return os.getpid()
+
+
+class RenderPool:
+    def __init__(self, size: int = settings.RENDER_POOL_SIZE):
+        self.size = size
+        self.executor = None
+
+    def start(self):
+        if self.executor is not None:
+            return
+
+        if self.size <= 0:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="render")
+            print("✓ Render pool: in-process (RENDER_POOL_SIZE=0)")
+            return
+
+        # spawn, not fork: the parent already has an event loop and DB threads
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.size,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_worker
+        )
+        # Start every worker now so the first requests don't pay for it
+        pids = set(self.executor.map(_ping, range(self.size)))
+        print(f"✓ Render pool: {len(pids)} worker process(es) warmed up")
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+
+    async def run(self, fn, *args):
+        """Run `fn(*args)` in the pool and await its result"""
+        if self.executor is None:
+            self.start()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, fn, *args)
+
+
+render_pool = RenderPool()
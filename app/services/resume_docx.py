@@ -0,0 +1,92 @@
+"""
+DOCX resume rendering (python-docx).
+
+Builds the same sections, in the same order, as the `professional` HTML
+template from the context produced by `ResumeGeneratorService.build_context`.
+`render_docx_bytes` is a module-level function so it can run in the render
+pool's worker processes.
+"""
+from docx import Document
+from docx.shared import Pt
+import io
+
+
+def _lines(text) -> list:
+    return [line.strip() for line in (text or "").split("\n") if line.strip()]
+
+
+def _section(doc, title: str):
+    doc.add_heading(title, level=2)
+
+
+def _bullets(doc, items):
+    for item in items:
+        doc.add_paragraph(str(item), style="List Bullet")
+
+
+def render_docx_bytes(context: dict) -> bytes:
+    """Render a resume context to DOCX bytes (runs in render pool workers)"""
+    doc = Document()
+    doc.styles["Normal"].font.size = Pt(10)
+
+    # Header
+    doc.add_heading(context.get("name") or "", level=0)
+    contact = [f"Phone: {context['phone']}" if context.get("phone") else None,
+               f"E-mail: {context['email']}" if context.get("email") else None]
+    if any(contact):
+        doc.add_paragraph(" | ".join(filter(None, contact)))
+
+    # Professional Summary
+    if context.get("summary"):
+        _section(doc, "Professional Summary")
+        doc.add_paragraph(context["summary"])
+
+    # Work Experience
+    if context.get("experiences"):
+        _section(doc, "Work Experience")
+        for exp in context["experiences"]:
+            doc.add_paragraph().add_run(exp.get("company") or "").bold = True
+            title = exp.get("title") or ""
+            if exp.get("start_date"):
+                title += f" (in {exp['start_date'][:4]})"
+            doc.add_paragraph().add_run(title).italic = True
+            _bullets(doc, _lines(exp.get("description")))
+
+    # Projects
+    if context.get("projects"):
+        _section(doc, "Projects")
+        for project in context["projects"]:
+            name = project.get("name") or ""
+            if project.get("year"):
+                name += f" ({project['year']})"
+            doc.add_paragraph().add_run(name).bold = True
+            _bullets(doc, _lines(project.get("description")))
+
+    # Educational Qualifications
+    if context.get("education"):
+        _section(doc, "Educational Qualifications")
+        for edu in context["education"]:
+            degree = edu.get("degree") or ""
+            if edu.get("year"):
+                degree += f" | {edu['year']}"
+            doc.add_paragraph().add_run(degree).bold = True
+            institution = edu.get("institution") or ""
+            if edu.get("location"):
+                institution += f", {edu['location']}"
+            doc.add_paragraph(institution)
+            details = " ".join(filter(None, [
+                f"Average CGPA: {edu['gpa']}" if edu.get("gpa") else None,
+                edu.get("grade"),
+            ]))
+            if details:
+                doc.add_paragraph(details)
+
+    # Technical Skills, Languages, Hobbies & Interests
+    for key, title in (("skills", "Technical Skills"), ("languages", "Languages"), ("hobbies", "Hobbies & Interests")):
+        if context.get(key):
+            _section(doc, title)
+            _bullets(doc, context[key])
+
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
@@ -0,0 +1,150 @@
+"""
+Bulk export of tailored resumes, one per saved job, as a streamed zip.
+
+Each resume is built from the user's profile document and tailored to the
+job with simple keyword matching: skills and projects that mention words from
+the job title/description are listed first. The PDFs are rendered in
+parallel through `resume_generator` (render pool + content-hash cache), and
+the zip is written to an unseekable buffer so every entry can be sent to the
+client as soon as its render finishes.
+
+Export renders are capped twice: per user by EXPORT_RENDERS_PER_USER (shared
+across all of their concurrent exports), and across all exports at half the
+render pool, so interactive renders (e.g. /generate/pdf) always find a free
+worker however large the batches are.
+"""
+import asyncio
+import re
+import zipfile
+from app.core.config import get_settings
+from app.models.models import SavedJob
+from app.schemas.schemas import ResumeData
+from app.services.render_pool import render_pool
+from app.services.resume_generator import resume_data_from_document, resume_generator
+
+settings = get_settings()
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it",
+    "of", "on", "or", "our", "the", "to", "we", "with", "you", "your", "will", "job",
+    "role", "team", "work", "experience", "m", "f", "d", "w",
+}
+
+# user id -> [semaphore, number of exports using it]
+_user_slots = {}
+# Shared by every export; created on first use (inside the event loop)
+_export_slots = None
+
+
+def _export_capacity() -> int:
+    """Renders all exports together may run: half the pool (at least one)"""
+    return max(1, render_pool.size // 2)
+
+
+def _shared_slots() -> asyncio.Semaphore:
+    global _export_slots
+    if _export_slots is None:
+        _export_slots = asyncio.Semaphore(_export_capacity())
+    return _export_slots
+
+
+def _keywords(text: str) -> set:
+    return {word.rstrip(".") for word in _WORD.findall((text or "").lower())} - _STOPWORDS
+
+
+def _relevance(keywords: set, *texts) -> int:
+    return len(keywords & _keywords(" ".join(str(text) for text in texts if text)))
+
+
+def tailor_resume(document: dict, job: SavedJob) -> ResumeData:
+    """ResumeData for a profile document, ordered for relevance to a saved job"""
+    keywords = _keywords(f"{job.title} {job.description}")
+
+    skills = []
+    categories = sorted(
+        document["skills"],
+        key=lambda s: -_relevance(keywords, s["category"], *s["skills"])
+    )
+    for category in categories:
+        # sorted() is stable, so unmatched skills keep their original order
+        ordered = sorted(category["skills"], key=lambda skill: -_relevance(keywords, skill))
+        skills.append(f"{category['category']}: {', '.join(ordered)}")
+
+    projects = sorted(
+        document["projects"],
+        key=lambda p: -_relevance(keywords, p["name"], p["description"], *p["technologies"])
+    )
+
+    return resume_data_from_document(document, skills=skills, projects=projects)
+
+
+def _entry_name(index: int, job: SavedJob) -> str:
+    label = re.sub(r"[^A-Za-z0-9_-]+", "_", f"{job.company or ''}_{job.title or ''}").strip("_")
+    return f"{index:02d}_{label or 'job'}.pdf"
+
+
+class _ChunkWriter:
+    """Write-only, unseekable file object; zipfile then emits data descriptors"""
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+async def _render(semaphore: asyncio.Semaphore, index: int, job: SavedJob, data: ResumeData, template_name: str):
+    async with semaphore, _shared_slots():
+        try:
+            _, pdf_bytes = await resume_generator.render_pdf(data, template_name=template_name)
+            return index, job, pdf_bytes, None
+        except Exception as e:
+            print(f"Export render error (job {job.id}): {e}")
+            return index, job, None, str(e)
+
+
+async def stream_tailored_zip(user_id: int, document: dict, jobs: list, template_name: str):
+    """Yield a zip archive of tailored resumes, one entry per job, in completion order"""
+    per_user = min(settings.EXPORT_RENDERS_PER_USER, _export_capacity())
+    slot = _user_slots.setdefault(user_id, [asyncio.Semaphore(per_user), 0])
+    slot[1] += 1
+
+    tasks = [
+        asyncio.ensure_future(_render(slot[0], index, job, tailor_resume(document, job), template_name))
+        for index, job in enumerate(jobs, start=1)
+    ]
+    writer = _ChunkWriter()
+    try:
+        # PDFs are already compressed; storing them avoids burning CPU for ~0% gain
+        with zipfile.ZipFile(writer, mode="w", compression=zipfile.ZIP_STORED) as archive:
+            for finished in asyncio.as_completed(tasks):
+                index, job, pdf_bytes, error = await finished
+                if error is None:
+                    archive.writestr(_entry_name(index, job), pdf_bytes)
+                else:
+                    # Keep going; one bad render shouldn't abort the whole archive
+                    archive.writestr(_entry_name(index, job)[:-4] + "_FAILED.txt", error)
+                yield writer.drain()
+        yield writer.drain()
+    finally:
+        # Client disconnected or a render failed: stop the remaining renders
+        for task in tasks:
+            task.cancel()
+        slot[1] -= 1
+        if slot[1] == 0:
+            _user_slots.pop(user_id, None)
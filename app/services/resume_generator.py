@@ -1,39 +1,194 @@
 
 
 from xhtml2pdf import pisa
-from fastapi.templating import Jinja2Templates
 from app.schemas.schemas import ResumeData
+from app.core.config import get_settings
+from app.core import metrics
+from app.services.render_pool import render_pool
+from app.services.pdf_optimizer import optimize_and_record, render_optimized
+from app.services.resume_docx import render_docx_bytes
+from app.services.resume_reportlab import LAYOUTS as REPORTLAB_LAYOUTS
+from app.core.cache import TTLCache
+from app.core.templates import templates, warmup
+import asyncio
+import hashlib
+import io
+import json
 import os
+import re
+import threading
+
+settings = get_settings()
+
+# Explicitly saved resumes (ResumeHistory), stored as <sha256 of the PDF>.pdf and
+# served immutably from /api/resume/artifacts/<sha256 of the PDF>.pdf
+OUTPUT_DIR = "app/static/generated_resumes"
+OUTPUT_URL = "/api/resume/artifacts"
+LEGACY_OUTPUT_URL = "/static/generated_resumes"  # Rows saved before artifact URLs
+ARTIFACT_NAME = re.compile(r"^[0-9a-f]{64}\.pdf$")
+
+
+def preload_templates():
+    """Compile every resume template up front (render pool warm-start)"""
+    warmup("resume_templates/")
+
+
+class RendererBackend:
+    """Turns a resume template + context into PDF bytes"""
+    name = None
+
+    def supports(self, template_name: str) -> bool:
+        return True
+
+    def render(self, template_name: str, context: dict) -> bytes:
+        raise NotImplementedError
+
+
+class XHTML2PDFBackend(RendererBackend):
+    """Renders the Jinja HTML template and converts it with xhtml2pdf (any template)"""
+    name = "xhtml2pdf"
+
+    def render(self, template_name: str, context: dict) -> bytes:
+        template = templates.get_template(template_name)
+
+        # 1. Render with unpacked context
+        html_content = template.render(**context)
+
+        # 2. Convert to PDF using xhtml2pdf, entirely in memory
+        buffer = io.BytesIO()
+        pisa_status = pisa.CreatePDF(
+            html_content,                # the HTML to convert
+            dest=buffer                  # buffer to recieve result
+        )
+
+        if pisa_status.err:
+            raise Exception(f"PDF generation failed: {pisa_status.err}")
+
+        return buffer.getvalue()
+
+
+class ReportLabBackend(RendererBackend):
+    """Lays the resume out directly with ReportLab platypus (templates with a layout only)"""
+    name = "reportlab"
+
+    def supports(self, template_name: str) -> bool:
+        return template_name in REPORTLAB_LAYOUTS
+
+    def render(self, template_name: str, context: dict) -> bytes:
+        return REPORTLAB_LAYOUTS[template_name](context)
+
+
+BACKENDS = {backend.name: backend for backend in (XHTML2PDFBackend(), ReportLabBackend())}
+DEFAULT_BACKEND = "xhtml2pdf"
+
+
+def template_backends() -> dict:
+    """Per-template backend choice from RESUME_TEMPLATE_BACKENDS ("professional=reportlab,...")"""
+    choices = {}
+    for item in settings.RESUME_TEMPLATE_BACKENDS.split(","):
+        if "=" in item:
+            template_name, backend = (part.strip() for part in item.split("=", 1))
+            if backend not in BACKENDS:
+                print(f"WARNING: Unknown renderer backend '{backend}' for template '{template_name}'")
+                continue
+            choices[f"resume_templates/{template_name}.html"] = backend
+    return choices
+
+
+def render_pdf_bytes(template_name: str, context: dict, backend: str = DEFAULT_BACKEND) -> bytes:
+    """Render a resume template to PDF bytes (runs in render pool workers)"""
+    return BACKENDS[backend].render(template_name, context)
+
+
+def resume_data_from_document(document: dict, skills: list | None = None, projects: list | None = None) -> ResumeData:
+    """
+    ResumeData for a profile document. `skills` (formatted lines) and
+    `projects` (document rows) override the document's own order.
+    """
+    personal = document["profile"]
+    if skills is None:
+        skills = [f"{s['category']}: {', '.join(s['skills'])}" for s in document["skills"]]
+    if projects is None:
+        projects = document["projects"]
+
+    return ResumeData(
+        full_name=personal["full_name"] or "",
+        email=personal["email"] or "",
+        phone=personal["phone"],
+        summary=personal["summary"],
+        experience=[
+            {
+                "title": exp["title"],
+                "company": exp["company"],
+                "start_date": exp["start_date"],
+                "description": "\n".join(filter(None, [exp["description"], *exp["achievements"]])),
+            }
+            for exp in document["experiences"]
+        ],
+        education=[
+            {
+                "degree": edu["degree"],
+                "institution": edu["institution"],
+                "location": edu["location"],
+                "year": edu["graduation_date"],
+                "gpa": edu["gpa"],
+            }
+            for edu in document["education"]
+        ],
+        skills=skills,
+        projects=[
+            {"name": proj["name"], "description": proj["description"], "year": proj["date"]}
+            for proj in projects
+        ],
+        languages=personal["languages"],
+        hobbies=personal["hobbies"],
+    )
 
-templates = Jinja2Templates(directory="app/templates")
 
 class ResumeGeneratorService:
-    def __init__(self):
-        pass
-        
-    def generate_pdf(self, data: ResumeData, template_name: str = "professional") -> str:
-        """
-        Generates a PDF resume from data and returns the file path.
-        """
-        # 1. Render HTML
-        # Map template_name to filename
+    def __init__(self, output_dir: str = OUTPUT_DIR):
+        self.output_dir = output_dir
+        self._template_versions = {}  # filename -> (mtime_ns, sha256)
+        self.backends = template_backends()  # template path -> backend name
+        self._inflight = {}  # content hash -> Future of a render in progress
+        # "<content hash>.pdf" / "<content hash>.docx" -> rendered bytes
+        self.cache = TTLCache(
+            max_entries=settings.RESUME_CACHE_MAX_ENTRIES,
+            max_bytes=settings.RESUME_CACHE_MAX_BYTES
+        )
+
+    def _get_template(self, template_name: str):
         # Ensure secure path
-        safe_name = os.path.basename(template_name) 
+        safe_name = os.path.basename(template_name)
         template_path = f"resume_templates/{safe_name}.html"
-        
+
         try:
-            template = templates.get_template(template_path)
+            return templates.get_template(template_path)
         except:
             # Fallback
             print(f"Template {template_name} not found, defaulting...")
-            template = templates.get_template("resume_templates/professional.html")
-            
-        # Prepare Context for Jinja (Adapter)
+            return templates.get_template("resume_templates/professional.html")
+
+    def _template_version(self, template) -> str:
+        """Hash of the template source, recomputed only when the file changes"""
+        mtime_ns = os.stat(template.filename).st_mtime_ns
+        cached = self._template_versions.get(template.filename)
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+
+        with open(template.filename, "rb") as f:
+            version = hashlib.sha256(f.read()).hexdigest()
+        self._template_versions[template.filename] = (mtime_ns, version)
+        return version
+
+    def build_context(self, data: ResumeData) -> dict:
+        """Prepare Context for Jinja (Adapter)"""
         context = data.dict()
-        
-        # 1. Map full_name -> name
+
+        # 1. Map full_name -> name, experience -> experiences (template names)
         context['name'] = context.get('full_name', '')
-        
+        context['experiences'] = context.pop('experience', [])
+
         # 2. Skills - keep as list (template expects list, not dict)
         raw_skills = context.get('skills', [])
         if isinstance(raw_skills, list):
@@ -41,9 +196,8 @@ class ResumeGeneratorService:
         else:
             # If it's already a dict or other format, try to extract values
             context['skills'] = list(raw_skills.values()) if isinstance(raw_skills, dict) else []
-        
+
         # 3. Languages - parse from JSON string if needed
-        import json
         raw_languages = context.get('languages', [])
         if isinstance(raw_languages, str):
             try:
@@ -54,7 +208,7 @@ class ResumeGeneratorService:
             context['languages'] = raw_languages
         else:
             context['languages'] = []
-        
+
         # 4. Hobbies - parse from JSON string if needed
         raw_hobbies = context.get('hobbies', [])
         if isinstance(raw_hobbies, str):
@@ -66,26 +220,127 @@ class ResumeGeneratorService:
             context['hobbies'] = raw_hobbies
         else:
             context['hobbies'] = []
-             
-        # Render with unpacked context
-        html_content = template.render(**context)
-        
-        # 2. Output Path
-        output_dir = "app/static/generated_resumes"
-        os.makedirs(output_dir, exist_ok=True)
-        filename = f"resume_{data.full_name.replace(' ', '_')}.pdf"
-        output_path = os.path.join(output_dir, filename)
-        
-        # 3. Convert to PDF using xhtml2pdf
-        with open(output_path, "wb") as pdf_file:
-            pisa_status = pisa.CreatePDF(
-                html_content,                # the HTML to convert
-                dest=pdf_file                # file handle to recieve result
-            )
 
-        if pisa_status.err:
-            raise Exception(f"PDF generation failed: {pisa_status.err}")
-            
-        return output_path
+        return context
+
+    def backend_for(self, template) -> str:
+        """Configured PDF backend for a template, falling back to xhtml2pdf"""
+        backend = self.backends.get(template.name, DEFAULT_BACKEND)
+        if not BACKENDS[backend].supports(template.name):
+            return DEFAULT_BACKEND
+        return backend
+
+    def cache_key(self, context: dict, template) -> str:
+        """Content hash of the canonicalized context plus template name, version and backend"""
+        canonical = json.dumps(
+            {
+                "template": template.name,
+                "template_version": self._template_version(template),
+                "backend": self.backend_for(template),
+                "context": context,
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _prepare(self, data: ResumeData, template_name: str) -> tuple:
+        """(template, context, content hash) for a render request"""
+        template = self._get_template(template_name)
+        context = self.build_context(data)
+        return template, context, self.cache_key(context, template)
+
+    def content_key(self, data: ResumeData, template_name: str = "professional") -> str:
+        return self._prepare(data, template_name)[2]
+
+    def _render_finished(self, cache_key: str, future: asyncio.Future):
+        self._inflight.pop(cache_key, None)
+        if not future.cancelled() and future.exception() is None:
+            self.cache.set(cache_key, future.result())
+
+    async def _render(self, cache_key: str, run, fn, *args) -> bytes:
+        """
+        Cached render: served from the in-memory cache when possible, otherwise
+        `await run(fn, *args)` (render pool); concurrent identical misses share
+        one render.
+        """
+        output = self.cache.get(cache_key)
+        if output is not None:
+            return output
+
+        pending = self._inflight.get(cache_key)
+        if pending is None:
+            pending = asyncio.ensure_future(run(fn, *args))
+            self._inflight[cache_key] = pending
+            pending.add_done_callback(lambda future: self._render_finished(cache_key, future))
+
+        # shield: one caller going away must not cancel the render for the others
+        return await asyncio.shield(pending)
+
+    async def render_pdf(self, data: ResumeData, template_name: str = "professional") -> tuple[str, bytes]:
+        """
+        Render a resume to PDF in memory and return (content hash, pdf bytes).
+        Nothing is written to disk.
+        """
+        template, context, key = self._prepare(data, template_name)
+        return key, await self._render(
+            f"{key}.pdf", render_optimized, render_pdf_bytes, template.name, context, self.backend_for(template)
+        )
+
+    async def render_docx(self, data: ResumeData, template_name: str = "professional") -> tuple[str, bytes]:
+        """
+        Render a resume to DOCX in memory and return (content hash, docx bytes).
+        Uses the same context, content hash, cache and render pool as PDFs.
+        """
+        _, context, key = self._prepare(data, template_name)
+        return key, await self._render(f"{key}.docx", render_pool.run, render_docx_bytes, context)
+
+    def save_pdf(self, pdf_bytes: bytes) -> str:
+        """Persist a rendered PDF under the SHA-256 of its bytes and return its (immutable) URL"""
+        # Named after the output, not the render inputs: a renderer, optimizer
+        # or PDF_OPTIMIZE change must never put different bytes behind a URL
+        key = hashlib.sha256(pdf_bytes).hexdigest()
+        os.makedirs(self.output_dir, exist_ok=True)
+        output_path = os.path.join(self.output_dir, f"{key}.pdf")
+
+        if not os.path.exists(output_path):
+            # temp file + rename so readers never see partial output
+            tmp_path = f"{output_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(pdf_bytes)
+            os.replace(tmp_path, output_path)
+
+        return f"{OUTPUT_URL}/{key}.pdf"
+
+    def saved_path(self, url: str) -> str | None:
+        """Filesystem path of a PDF saved by save_pdf, or None for other URLs"""
+        if not url or not url.startswith((f"{OUTPUT_URL}/", f"{LEGACY_OUTPUT_URL}/")):
+            return None
+        return os.path.join(self.output_dir, os.path.basename(url))
+
+    def artifact_path(self, name: str) -> str | None:
+        """Filesystem path of a saved artifact ("<sha256 of its bytes>.pdf") if it exists"""
+        if not ARTIFACT_NAME.match(name):
+            return None
+        path = os.path.join(self.output_dir, name)
+        return path if os.path.exists(path) else None
+
+    def delete_saved_pdf(self, url: str):
+        path = self.saved_path(url)
+        if path and os.path.exists(path):
+            os.remove(path)
+
+    def generate_pdf(self, data: ResumeData, template_name: str = "professional") -> str:
+        """
+        Generates a PDF resume from data, saves it and returns the file path.
+        """
+        template, context, key = self._prepare(data, template_name)
+        pdf_bytes = self.cache.get(f"{key}.pdf")
+        if pdf_bytes is None:
+            pdf_bytes = optimize_and_record(render_pdf_bytes(template.name, context, self.backend_for(template)))
+            self.cache.set(f"{key}.pdf", pdf_bytes)
+        return self.saved_path(self.save_pdf(pdf_bytes))
 
 resume_generator = ResumeGeneratorService()
+metrics.register("resume_cache", resume_generator.cache.stats)
@@ -0,0 +1,87 @@
+"""
+Live HTML preview of a resume, rendered one section at a time.
+
+Resume templates wrap each section in a `{% block %}` (header, summary,
+experience, ...). A preview renders those blocks individually and caches
+every fragment under a hash of the section's own data plus the template
+version, so after an edit only the changed section is re-rendered; the rest
+come straight from the cache. Clients send the hashes they already hold
+(`known`) and get `html: null` back for those sections.
+"""
+import hashlib
+import json
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+from app.core import metrics
+from app.schemas.schemas import ResumeData
+from app.services.resume_generator import resume_generator
+
+settings = get_settings()
+
+# Template block -> context keys it reads (in document order)
+SECTIONS = {
+    "header": ("name", "phone", "email"),
+    "summary": ("summary",),
+    "experience": ("experiences",),
+    "projects": ("projects",),
+    "education": ("education",),
+    "skills": ("skills",),
+    "languages": ("languages",),
+    "hobbies": ("hobbies",),
+}
+
+
+class ResumePreviewService:
+    def __init__(self):
+        # section hash -> rendered HTML fragment
+        self.cache = TTLCache(max_entries=settings.RESUME_PREVIEW_CACHE_MAX_ENTRIES)
+
+    def template_version(self, template_name: str) -> str:
+        template = resume_generator._get_template(template_name)
+        return resume_generator._template_version(template)
+
+    def _section_hash(self, template, version: str, section: str, values: dict) -> str:
+        canonical = json.dumps(
+            {"template": template.name, "version": version, "section": section, "values": values},
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+    def _render_block(self, template, section: str, values: dict, key: str) -> str:
+        html = self.cache.get(key)
+        if html is None:
+            html = "".join(template.blocks[section](template.new_context(values))).strip()
+            self.cache.set(key, html)
+        return html
+
+    def render(self, data: ResumeData, template_name: str = "professional", known: set = frozenset()) -> dict:
+        """
+        Per-section HTML for a resume. Sections whose hash is in `known` are
+        returned without their HTML (the client already has it).
+        """
+        template = resume_generator._get_template(template_name)
+        version = resume_generator._template_version(template)
+        context = resume_generator.build_context(data)
+
+        sections = []
+        for section, fields in SECTIONS.items():
+            if section not in template.blocks:
+                continue
+            values = {field: context.get(field) for field in fields}
+            key = self._section_hash(template, version, section, values)
+            html = None if key in known else self._render_block(template, section, values, key)
+            sections.append({"name": section, "hash": key, "html": html})
+
+        styles = ""
+        if "styles" in template.blocks:
+            styles = self._render_block(
+                template, "styles", {}, self._section_hash(template, version, "styles", {})
+            )
+
+        return {"template": template.name, "version": version[:16], "styles": styles, "sections": sections}
+
+
+resume_preview = ResumePreviewService()
+metrics.register("resume_preview_cache", resume_preview.cache.stats)
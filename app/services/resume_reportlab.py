@@ -0,0 +1,138 @@
+"""
+Direct ReportLab (platypus) layouts for resume templates.
+
+Each layout reproduces an HTML resume template without the HTML/CSS
+round-trip through xhtml2pdf, which makes it several times faster. Layouts
+take the context produced by `ResumeGeneratorService.build_context`.
+"""
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import cm
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, ListFlowable, ListItem, KeepTogether
+from reportlab.platypus.flowables import HRFlowable
+from xml.sax.saxutils import escape
+import io
+
+# Styles mirror the CSS in resume_templates/professional.html (built once per process)
+_NAME = ParagraphStyle("Name", fontName="Helvetica-Bold", fontSize=20, leading=24, spaceAfter=5)
+_CONTACT = ParagraphStyle("Contact", fontName="Helvetica", fontSize=10, leading=13, spaceAfter=15)
+_SECTION = ParagraphStyle("Section", fontName="Helvetica-Bold", fontSize=12, leading=15, spaceBefore=15)
+_BODY = ParagraphStyle("Body", fontName="Helvetica", fontSize=10, leading=14, spaceAfter=3)
+_BOLD = ParagraphStyle("Bold", parent=_BODY, fontName="Helvetica-Bold", spaceAfter=0)
+_COMPANY = ParagraphStyle("Company", parent=_BOLD, fontSize=11, leading=15)
+_JOB_TITLE = ParagraphStyle("JobTitle", parent=_BODY, spaceBefore=2, spaceAfter=5)
+
+
+def _text(value) -> str:
+    return escape(str(value)) if value else ""
+
+
+def _lines(text) -> list:
+    return [line.strip() for line in (text or "").split("\n") if line.strip()]
+
+
+def _section(title: str) -> list:
+    return [
+        Paragraph(title, _SECTION),
+        HRFlowable(width="100%", thickness=1, color=colors.black, spaceBefore=2, spaceAfter=8),
+    ]
+
+
+def _bullets(lines: list) -> list:
+    if not lines:
+        return []
+    return [ListFlowable(
+        [ListItem(Paragraph(_text(line), _BODY)) for line in lines],
+        bulletType="bullet",
+        start="•",
+        leftIndent=20,
+        bulletFontSize=10,
+    )]
+
+
+def render_professional(context: dict) -> bytes:
+    """The `professional` template as PDF bytes"""
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=A4,
+        leftMargin=2 * cm, rightMargin=2 * cm,
+        topMargin=1.5 * cm, bottomMargin=1.5 * cm,
+        title=f"{context.get('name') or ''} - Resume",
+    )
+
+    # Header
+    story = [Paragraph(_text(context.get("name")), _NAME)]
+    contact = []
+    if context.get("phone"):
+        contact.append(f"Phone: {_text(context['phone'])}")
+    if context.get("email"):
+        contact.append(f"E-mail: {_text(context['email'])}")
+    story.append(Paragraph("<br/>".join(contact), _CONTACT))
+
+    # Professional Summary
+    if context.get("summary"):
+        story += _section("Professional Summary")
+        story.append(Paragraph(_text(context["summary"]), _BODY))
+
+    # Work Experience
+    if context.get("experiences"):
+        story += _section("Work Experience")
+        for exp in context["experiences"]:
+            title = _text(exp.get("title"))
+            if exp.get("start_date"):
+                title += f" (in {_text(exp['start_date'][:4])})"
+            story.append(KeepTogether([
+                Paragraph(_text(exp.get("company")), _COMPANY),
+                Paragraph(title, _JOB_TITLE),
+                *_bullets(_lines(exp.get("description"))),
+                Spacer(1, 12),
+            ]))
+
+    # Projects
+    if context.get("projects"):
+        story += _section("Projects: -")
+        for project in context["projects"]:
+            name = _text(project.get("name"))
+            if project.get("year"):
+                name += f" ({_text(project['year'])})"
+            story.append(KeepTogether([
+                Paragraph(name, _BOLD),
+                *_bullets(_lines(project.get("description"))),
+                Spacer(1, 10),
+            ]))
+
+    # Educational Qualifications
+    if context.get("education"):
+        story += _section("Educational Qualifications: -")
+        for edu in context["education"]:
+            degree = _text(edu.get("degree"))
+            if edu.get("year"):
+                degree += f" | {_text(edu['year'])}"
+            institution = _text(edu.get("institution"))
+            if edu.get("location"):
+                institution += f", {_text(edu['location'])}"
+            item = [Paragraph(degree, _BOLD), Paragraph(institution, _BODY)]
+            details = " ".join(filter(None, [
+                f"Average CGPA: {_text(edu['gpa'])}" if edu.get("gpa") else None,
+                _text(edu.get("grade")),
+            ]))
+            if details:
+                item.append(Paragraph(details, _BODY))
+            story.append(KeepTogether(item + [Spacer(1, 10)]))
+
+    # Technical Skills, Languages, Hobbies & Interests (unbulleted lists)
+    for key, title in (("skills", "Technical Skills: -"), ("languages", "Languages"), ("hobbies", "Hobbies &amp; Interests")):
+        if context.get(key):
+            story += _section(title)
+            story += [Paragraph(_text(item), _BODY) for item in context[key]]
+
+    doc.build(story)
+    return buffer.getvalue()
+
+
+# Template path -> layout
+LAYOUTS = {
+    "resume_templates/professional.html": render_professional,
+}
@@ -0,0 +1,102 @@
+"""
+Compare resume PDF renderer backends (xhtml2pdf vs ReportLab).
+
+For small / medium / large synthetic profiles, reports per-backend render
+latency (median and p95 over --iterations runs), peak Python memory during a
+render (tracemalloc) and output size.
+
+Run from the project root:
+    python -m benchmarks.bench_renderers [--iterations 10] [--template professional]
+"""
+import argparse
+import statistics
+import time
+import tracemalloc
+
+from app.schemas.schemas import ResumeData
+from app.services.resume_generator import BACKENDS, render_pdf_bytes, resume_generator
+
+
+def make_profile(experiences: int, projects: int, skills: int) -> ResumeData:
+    return ResumeData(
+        full_name="Jane Example",
+        email="jane@example.com",
+        phone="+1 555 0100",
+        summary="Backend engineer focused on reliable, observable services. " * 3,
+        experience=[
+            {
+                "title": f"Software Engineer {i}",
+                "company": f"Company {i}",
+                "start_date": f"{2024 - i}-01",
+                "description": "\n".join(f"Delivered improvement {j} across the platform & reduced latency" for j in range(4)),
+            }
+            for i in range(experiences)
+        ],
+        education=[
+            {"degree": "BSc Computer Science", "institution": "Example University", "location": "Berlin", "year": "2015", "gpa": "3.8"}
+        ],
+        skills=[f"Category {i}: Python, SQL, Docker, Kubernetes, AWS" for i in range(skills)],
+        projects=[
+            {"name": f"Project {i}", "description": "Built a thing\nScaled it to many users", "year": "2023"}
+            for i in range(projects)
+        ],
+        languages=["English", "German"],
+        hobbies=["Climbing", "Chess"],
+    )
+
+
+PROFILES = {
+    "small": make_profile(experiences=1, projects=1, skills=2),
+    "medium": make_profile(experiences=4, projects=3, skills=5),
+    "large": make_profile(experiences=12, projects=10, skills=12),
+}
+
+
+def bench(backend: str, template_name: str, context: dict, iterations: int) -> dict:
+    # Warm-up (imports, font/template caches)
+    output = render_pdf_bytes(template_name, context, backend)
+
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        render_pdf_bytes(template_name, context, backend)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    render_pdf_bytes(template_name, context, backend)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings.sort()
+    return {
+        "median_ms": statistics.median(timings) * 1000,
+        "p95_ms": timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1000,
+        "peak_kb": peak / 1024,
+        "size_kb": len(output) / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--template", default="professional")
+    args = parser.parse_args()
+
+    template = resume_generator._get_template(args.template)
+    print(f"Template: {template.name}, {args.iterations} iterations\n")
+    print(f"{'profile':<8} {'backend':<10} {'median ms':>10} {'p95 ms':>10} {'peak KB':>10} {'size KB':>9}")
+
+    for profile_name, data in PROFILES.items():
+        context = resume_generator.build_context(data)
+        for backend in BACKENDS.values():
+            if not backend.supports(template.name):
+                continue
+            result = bench(backend.name, template.name, context, args.iterations)
+            print(
+                f"{profile_name:<8} {backend.name:<10} {result['median_ms']:>10.1f} {result['p95_ms']:>10.1f} "
+                f"{result['peak_kb']:>10.0f} {result['size_kb']:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+import os
+import tempfile
+
+# Point the app at a throwaway database before any app module reads the settings
+_db_dir = tempfile.mkdtemp(prefix="resume_gen_tests_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+os.environ.setdefault("JOB_INGEST_ENABLED", "false")
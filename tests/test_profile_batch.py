@@ -0,0 +1,84 @@
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.endpoints.profile import ProfileBatchRequest, apply_profile_batch
+from app.db.database import SessionLocal, init_db
+from app.models.models import Experience, User
+
+
+@pytest.fixture
+def db():
+    init_db()
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def user_id(db):
+    user = User(email=f"{uuid.uuid4().hex}@example.com")
+    db.add(user)
+    db.commit()
+    return user.id
+
+
+def _experiences(db, user_id, count):
+    rows = [
+        Experience(user_id=user_id, title=f"Role {i}", company="Acme", start_date="2020", order=i)
+        for i in range(count)
+    ]
+    db.add_all(rows)
+    db.commit()
+    return [row.id for row in rows]
+
+
+def _apply(db, user_id, operations):
+    request = SimpleNamespace(state=SimpleNamespace(user_id=user_id), session={})
+    return asyncio.run(apply_profile_batch(request, ProfileBatchRequest(operations=operations), db))
+
+
+def _titles(user_id):
+    session = SessionLocal()
+    try:
+        rows = session.query(Experience).filter(Experience.user_id == user_id).order_by(Experience.order)
+        return [row.title for row in rows]
+    finally:
+        session.close()
+
+
+def test_update_after_delete_is_rejected(db, user_id):
+    ids = _experiences(db, user_id, 2)
+    with pytest.raises(HTTPException) as error:
+        _apply(db, user_id, [
+            {"op": "delete", "section": "experience", "id": ids[0]},
+            {"op": "update", "section": "experience", "id": ids[0],
+             "data": {"title": "Renamed", "company": "Acme", "start_date": "2020", "end_date": "2021"}},
+        ])
+    assert error.value.status_code == 400
+    assert "deleted earlier" in error.value.detail
+    assert _titles(user_id) == ["Role 0", "Role 1"]
+
+
+def test_reorder_after_delete_is_rejected(db, user_id):
+    ids = _experiences(db, user_id, 3)
+    with pytest.raises(HTTPException) as error:
+        _apply(db, user_id, [
+            {"op": "delete", "section": "experience", "id": ids[1]},
+            {"op": "reorder", "section": "experience", "ids": [ids[2], ids[1], ids[0]]},
+        ])
+    assert error.value.status_code == 400
+    assert "deleted earlier" in error.value.detail
+    assert _titles(user_id) == ["Role 0", "Role 1", "Role 2"]
+
+
+def test_partial_reorders_keep_unlisted_rows_after_listed_ones(db, user_id):
+    ids = _experiences(db, user_id, 4)
+    _apply(db, user_id, [
+        {"op": "reorder", "section": "experience", "ids": [ids[2]]},
+        {"op": "reorder", "section": "experience", "ids": [ids[1], ids[0]]},
+    ])
+    assert _titles(user_id) == ["Role 1", "Role 0", "Role 2", "Role 3"]